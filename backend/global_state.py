@@ -1,8 +1,8 @@
 import asyncio
+import threading
+import time
 from enum import Enum
 from typing import List, Dict, Any
-from collections import deque
-from datetime import datetime
 
 class TaskStatus(str, Enum):
     IDLE = "IDLE"
@@ -12,6 +12,24 @@ class TaskStatus(str, Enum):
     COMPLETED = "COMPLETED"
     ERROR = "ERROR"
 
+LOG_CAPACITY = 2000  # Keep last 2000 lines
+LOG_FLUSH_INTERVAL = 0.05  # Coalesce log notifications into 50ms batches
+
+_last_timestamp = (-1, "")
+
+
+def _log_timestamp():
+    """HH:MM:SS for the current second, formatted at most once per second."""
+    global _last_timestamp
+    sec = int(time.time())
+    cached_sec, text = _last_timestamp
+    if sec != cached_sec:
+        lt = time.localtime(sec)
+        text = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        _last_timestamp = (sec, text)
+    return text
+
+
 class GlobalState:
     _instance = None
 
@@ -23,8 +41,11 @@ class GlobalState:
 
     def init(self):
         self.status = TaskStatus.IDLE
-        self.logs = deque(maxlen=2000)  # Keep last 2000 lines
+        # Preallocated ring buffer; slot for entry n is n % LOG_CAPACITY
+        self.logs = [None] * LOG_CAPACITY
         self.log_count = 0 # Monotonic counter for reliable polling
+        # Slot write + count bump must be atomic; add_log runs on several threads at once
+        self._log_lock = threading.Lock()
         self.tasks = {
             "download_360p": {"status": "pending", "progress": 0},
             "process_transcription": {"status": "pending", "progress": 0},
@@ -32,23 +53,65 @@ class GlobalState:
             "burn_video": {"status": "pending", "progress": 0}
         }
         self.error_msg = None
+        self.debug_enabled = True  # Log tracebacks for failed steps
         self.subscribers = []
+        # Immutable snapshot; rebuilt under the lock on (un)subscribe so the flusher
+        # can iterate it without locking.
+        self.log_subscribers = ()
+        self._subscribers_lock = threading.Lock()
+        self._log_event = threading.Event()
+        self._log_flusher = threading.Thread(target=self._flush_logs, name="_log_flusher", daemon=True)
+        self._log_flusher.start()
 
     def update_task_status(self, task_name: str, status: str):
-        if task_name in self.tasks:
-            self.tasks[task_name]["status"] = status
+        task = self.tasks.get(task_name)
+        if task is not None and task["status"] != status:
+            task["status"] = status
             self.notify_subscribers()
 
     def set_status(self, status: TaskStatus):
+        if self.status == status:
+            return
         self.status = status
         self.notify_subscribers()
 
     def add_log(self, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.logs.append(log_entry)
-        self.log_count += 1
-        # Notify logging listeners (handled via WebSocket usually)
+        log_entry = f"[{_log_timestamp()}] {message}"
+        with self._log_lock:
+            self.logs[self.log_count % LOG_CAPACITY] = log_entry
+            self.log_count += 1
+        # Log listeners are notified in batches by the flusher thread
+        self._log_event.set()
+
+    def subscribe_logs(self, callback):
+        """Register callback(log_count), invoked from the flusher thread when new logs arrive."""
+        with self._subscribers_lock:
+            self.log_subscribers = self.log_subscribers + (callback,)
+
+    def unsubscribe_logs(self, callback):
+        with self._subscribers_lock:
+            self.log_subscribers = tuple(cb for cb in self.log_subscribers if cb != callback)
+
+    def _flush_logs(self):
+        while True:
+            self._log_event.wait()
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self._log_event.clear()
+            count = self.log_count
+            for callback in self.log_subscribers:
+                try:
+                    callback(count)
+                except Exception:
+                    pass
+
+    def get_logs_since(self, cursor: int):
+        """Return (entries, new_cursor) for log lines written after `cursor`."""
+        with self._log_lock:
+            end = self.log_count
+            start = max(cursor, end - LOG_CAPACITY, 0)
+            logs = self.logs
+            entries = [logs[i % LOG_CAPACITY] for i in range(start, end)]
+        return [e for e in entries if e is not None], end
 
     def reset(self):
         self.status = TaskStatus.IDLE
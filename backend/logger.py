@@ -4,6 +4,9 @@ from backend.global_state import state
 
 import re
 
+# ANSI color/control sequences emitted by rich, tqdm, yt-dlp, etc.
+_ANSI_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
 class StreamToLogger(io.TextIOBase):
     """
     Fake file-like stream object that redirects writes to a logger instance.
@@ -12,10 +15,12 @@ class StreamToLogger(io.TextIOBase):
         self.original_stream = original_stream
 
     def write(self, buf):
-        if buf.strip():
-            # Strip ANSI color codes
-            clean_buf = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', buf)
-            state.add_log(clean_buf.strip())
+        text = buf.strip()
+        if text:
+            # Strip ANSI color codes (only when an escape is present)
+            if '\x1b' in text:
+                text = _ANSI_RE.sub('', text).strip()
+            state.add_log(text)
         self.original_stream.write(buf)
         return len(buf)
         
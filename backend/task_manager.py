@@ -1,17 +1,15 @@
-import fnmatch
+import ctypes
 import os
 import shutil
 import sys
 import threading
+import traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 
 from backend.global_state import state, TaskStatus
 
-# Ensure project root is on sys.path
-current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if current_dir not in sys.path:
-    sys.path.append(current_dir)
-
 from core import (
     downloader,
     transcriber,
@@ -25,18 +23,130 @@ from core import (
     subtitle_burner,
 )
 
+DOWNLOAD_TEMP_SUFFIXES = (".part", ".ytdl")
+TRACEBACK_LOG_CHUNKS = 20  # Innermost traceback chunks (frames + exception line) kept in logs
+RESET_RMTREE_WORKERS = 4  # Parallel rmtree of output/ subdirectories in reset_workspace
+FICLONE = 0x40049409  # linux/fs.h: share extents between files (btrfs, XFS)
+
+
+def _log_traceback():
+    """Log the current exception's traceback, keeping only its innermost frames."""
+    if not state.debug_enabled:
+        return
+    chunks = traceback.TracebackException(*sys.exc_info()).format()
+    header = next(chunks, "")
+    tail = deque(chunks, maxlen=TRACEBACK_LOG_CHUNKS)
+    state.add_log(header + "".join(tail))
+
+
+def _fast_stage(src, dst):
+    """Copy src to dst, preferring a CoW reflink or in-kernel copy over shutil's loop."""
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                try:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                except OSError:
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                    if remaining > 0:
+                        raise OSError("copy_file_range stopped early")
+            shutil.copystat(src, dst)
+            return
+        except (OSError, AttributeError):
+            pass
+    shutil.copy2(src, dst)
+
+
+class WorkflowStopped(Exception):
+    """Raised at a pipeline step boundary once stop has been requested."""
+
 
 class TaskManager:
     def __init__(self):
-        self.workflow_thread = None
-        self.worker_threads = []
+        # Threads that force stop may interrupt; guarded so a thread is only ever
+        # targeted while it is still running its task
+        self._stoppable_threads = set()
+        self._stoppable_lock = threading.Lock()
+        self.workflow_future = None
+        self.worker_futures = []
         self.stop_flag = threading.Event()
         self.local_video_filename = None
         self.local_video_source_path = None
         self.last_workflow_url = None
-        self.best_download_thread = None
+        self.best_download_future = None
+        self.best_download_process = None
+        # Set by stop to mark the running best-quality download as cancelled (not failed)
+        self.best_download_cancel = threading.Event()
         self.best_download_lock = threading.Lock()
 
+    def _submit(self, fn, *args, stoppable=True):
+        """
+        Run fn on its own daemon thread and return a Future for it.
+        Each task gets a dedicated thread (not a pool worker), so the SystemExit that force
+        stop injects can never leak into another task, and Ctrl+C never waits on a running step.
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def _run():
+            thread = threading.current_thread()
+            try:
+                if stoppable:
+                    with self._stoppable_lock:
+                        self._stoppable_threads.add(thread)
+                try:
+                    result = fn(*args)
+                finally:
+                    self._untrack_stoppable(thread)
+            except BaseException as e:
+                # Also catches a SystemExit injected just as fn returned
+                self._untrack_stoppable(thread)
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=_run, name=f"vsx-{getattr(fn, '__name__', 'task')}", daemon=True).start()
+        return future
+
+    def _untrack_stoppable(self, thread):
+        with self._stoppable_lock:
+            self._stoppable_threads.discard(thread)
+
+    def _run_processing_pipeline(self):
+        """Task A steps shared by the URL, local-file and continue runners."""
+        # Task A stages form a strict chain through files in output/log:
+        # ASR -> cleaned_chunks.xlsx (rewritten in place by the English corrector)
+        # -> split_by_nlp.txt -> split_by_meaning.txt -> terminology.json (summary,
+        # read by every translate chunk) -> translation_results.xlsx -> subtitles.
+        # Concurrency lives inside the stages (e.g. translate_all's chunk pool).
+        self._run_step("Running Whisper ASR...", transcriber.transcribe)
+        self._run_step("Correcting English ASR tokens...", english_corrector.correct_english_asr_tokens)
+        self._run_step("Splitting sentences (NLP)...", splitter_nlp.split_by_spacy)
+        self._run_step("Splitting sentences (Meaning)...", splitter_meaning.split_sentences_by_meaning)
+        self._run_step("Summarizing...", summarizer.get_summary)
+        self._run_step("Translating...", translator.translate_all)
+        self._run_step("Splitting for subtitles...", subtitle_splitter.split_for_sub_main)
+        self._run_step("Aligning timestamps...", subtitle_generator.align_timestamp_main)
+
+    def _run_step(self, message, step):
+        # Cooperative stop: every step boundary honours stop_flag, so the ctypes
+        # force stop is only needed to interrupt a step that is already running.
+        if self.stop_flag.is_set():
+            raise WorkflowStopped()
+        state.add_log(message)
+        step()
+
+    @staticmethod
+    def _is_running(future):
+        return future is not None and not future.done()
+
     def set_local_video(self, filename: str, source_path: str = None):
         self.local_video_filename = os.path.basename(filename)
         self.local_video_source_path = source_path
@@ -52,8 +162,6 @@ class TaskManager:
         return path if os.path.exists(path) else None
 
     def _force_stop_threads(self):
-        import ctypes
-
         def _raise_system_exit(thread_obj):
             if not thread_obj or not thread_obj.is_alive() or thread_obj.ident is None:
                 return False
@@ -66,46 +174,52 @@ class TaskManager:
                 return False
             return True
 
-        targets = []
-        if self.workflow_thread and self.workflow_thread.is_alive():
-            targets.append(self.workflow_thread)
-        targets.extend([t for t in self.worker_threads if t and t.is_alive()])
-        if (
-            self.best_download_thread
-            and self.best_download_thread.is_alive()
-            and self.best_download_thread not in targets
-        ):
-            targets.append(self.best_download_thread)
-
         killed = 0
-        for thread_obj in targets:
-            if _raise_system_exit(thread_obj):
-                killed += 1
-
-        self.worker_threads = []
+        with self._stoppable_lock:
+            # Under the lock a listed thread is still inside its task; pop it so it is hit at most once
+            targets = list(self._stoppable_threads)
+            self._stoppable_threads.clear()
+            for thread_obj in targets:
+                if _raise_system_exit(thread_obj):
+                    killed += 1
+
+        self.worker_futures = []
         return killed
 
+    def _terminate_download_process(self):
+        # Mark the cancel first so the download loop never treats this exit as a retryable failure
+        self.best_download_cancel.set()
+        proc = self.best_download_process
+        if proc is None or proc.poll() is not None:
+            return False
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+        return True
+
     def _cleanup_download_temp_files(self):
         output_dir = "output"
         if not os.path.exists(output_dir):
             return
 
+        # yt-dlp writes its temp files next to the final output, i.e. top level only.
         removed = 0
-        for root, _, files in os.walk(output_dir):
-            for filename in files:
-                if fnmatch.fnmatch(filename, "*.part") or fnmatch.fnmatch(filename, "*.ytdl"):
-                    file_path = os.path.join(root, filename)
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(DOWNLOAD_TEMP_SUFFIXES) and entry.is_file(follow_symlinks=False):
                     try:
-                        os.remove(file_path)
+                        os.remove(entry.path)
                         removed += 1
                     except Exception as e:
-                        state.add_log(f"Failed to remove temp file {file_path}: {e}")
+                        state.add_log(f"Failed to remove temp file {entry.path}: {e}")
 
         if removed > 0:
             state.add_log(f"Removed {removed} temporary download files (*.part/*.ytdl).")
 
     def start_workflow(self, url: str):
-        if self.workflow_thread and self.workflow_thread.is_alive():
+        if self._is_running(self.workflow_future):
             state.add_log("Workflow already running.")
             return
 
@@ -115,14 +229,14 @@ class TaskManager:
 
         self.stop_flag.clear()
 
-        self.workflow_thread = threading.Thread(target=self._workflow_runner, args=(url,))
-        self.workflow_thread.daemon = True
-        self.workflow_thread.start()
+        self.workflow_future = self._submit(self._workflow_runner, url)
         state.add_log(f"Starting workflow for URL: {url}")
 
     def stop_workflow(self):
         self.stop_flag.set()
         killed = self._force_stop_threads()
+        if self._terminate_download_process():
+            killed += 1
         self._cleanup_download_temp_files()
 
         for task in state.tasks.values():
@@ -135,7 +249,17 @@ class TaskManager:
         else:
             state.add_log("Stop requested. Waiting for blocking step to exit.")
 
-    def _run_download_best(self, url: str, manual_retry: bool = False):
+    def _start_download_best(self, url: str, manual_retry: bool = False):
+        """Submit Task B with a fresh cancel event (caller holds best_download_lock)."""
+        cancel_event = threading.Event()
+        self.best_download_cancel = cancel_event
+        # Not force-stoppable: stop cancels it through cancel_event and by terminating yt-dlp
+        self.best_download_future = self._submit(
+            self._run_download_best, url, manual_retry, cancel_event, stoppable=False
+        )
+        return self.best_download_future
+
+    def _run_download_best(self, url: str, manual_retry: bool = False, cancel_event=None):
         if manual_retry:
             state.set_status(TaskStatus.DOWNLOADING_BEST)
             state.add_log("Manual retry: downloading best quality video...")
@@ -145,7 +269,14 @@ class TaskManager:
             if not manual_retry:
                 state.add_log("Task B: Downloading Best Quality Video...")
 
-            downloader.download_video_ytdlp(url, resolution="best", suffix="_best")
+            # Child process keeps yt-dlp off this interpreter and lets stop terminate it cleanly
+            downloader.download_video_subprocess(
+                url,
+                resolution="best",
+                suffix="_best",
+                on_process=lambda proc: setattr(self, "best_download_process", proc),
+                cancel_event=cancel_event,
+            )
             state.update_task_status("download_best", "completed")
 
             if manual_retry:
@@ -153,15 +284,14 @@ class TaskManager:
                 state.add_log("Manual retry complete: best quality video downloaded.")
             else:
                 state.add_log("Task B: Best quality download complete.")
+        except downloader.DownloadCancelled:
+            state.add_log("Task B: Best quality download stopped.")
+            state.update_task_status("download_best", "stopped")
         except Exception as e:
             state.add_log(f"Task B Failed: {str(e)}")
             state.update_task_status("download_best", "error")
             if manual_retry:
                 state.set_status(TaskStatus.ERROR)
-        finally:
-            with self.best_download_lock:
-                if threading.current_thread() is self.best_download_thread:
-                    self.best_download_thread = None
 
     def retry_download_best(self, url: str = None):
         target_url = (url or self.last_workflow_url or "").strip()
@@ -169,23 +299,22 @@ class TaskManager:
             return False, "No source URL available for best-quality retry."
 
         with self.best_download_lock:
-            if self.best_download_thread and self.best_download_thread.is_alive():
+            if self._is_running(self.best_download_future):
                 return False, "Best-quality download is already running."
 
             self.last_workflow_url = target_url
-            thread = threading.Thread(
-                target=self._run_download_best,
-                args=(target_url, True),
-                name="_task_download_best_manual",
-                daemon=True,
-            )
-            self.best_download_thread = thread
-            thread.start()
+            self._start_download_best(target_url, manual_retry=True)
 
         return True, "Best-quality retry started."
 
     def _workflow_runner(self, url):
         try:
+            # Task B (best quality) only needs the URL, so start it before the 360p
+            # download instead of after it; the two yt-dlp runs share the network.
+            with self.best_download_lock:
+                future_b = self._start_download_best(url)
+            self.worker_futures = [future_b]
+
             # Step 1: download low-res file for ASR
             state.set_status(TaskStatus.DOWNLOADING_360P)
             state.update_task_status("download_360p", "running")
@@ -199,7 +328,7 @@ class TaskManager:
             if self.stop_flag.is_set():
                 return
 
-            # Step 2: process + best download in parallel
+            # Step 2: process while the best download keeps running
             state.set_status(TaskStatus.PROCESSING)
 
             def run_processing():
@@ -207,51 +336,22 @@ class TaskManager:
                 try:
                     state.add_log("Task A: Starting Audio/Subtitle Processing...")
 
-                    state.add_log("Running Whisper ASR...")
-                    transcriber.transcribe()
-
-                    state.add_log("Correcting English ASR tokens...")
-                    english_corrector.correct_english_asr_tokens()
-
-                    state.add_log("Splitting sentences (NLP)...")
-                    splitter_nlp.split_by_spacy()
-
-                    state.add_log("Splitting sentences (Meaning)...")
-                    splitter_meaning.split_sentences_by_meaning()
-
-                    state.add_log("Summarizing...")
-                    summarizer.get_summary()
-
-                    state.add_log("Translating...")
-                    translator.translate_all()
-
-                    state.add_log("Splitting for subtitles...")
-                    subtitle_splitter.split_for_sub_main()
-
-                    state.add_log("Aligning timestamps...")
-                    subtitle_generator.align_timestamp_main()
+                    self._run_processing_pipeline()
 
                     state.update_task_status("process_transcription", "completed")
                     state.add_log("Task A: Processing pipeline completed successfully.")
+                except WorkflowStopped:
+                    state.add_log("Processing stopped before next step.")
                 except Exception as e:
                     state.add_log(f"Task A Failed: {str(e)}")
                     state.update_task_status("process_transcription", "error")
                     state.set_status(TaskStatus.ERROR)
-                    import traceback
-
-                    state.add_log(traceback.format_exc())
+                    _log_traceback()
 
-            thread_a = threading.Thread(target=run_processing, name="_task_processing")
-            thread_b = threading.Thread(target=self._run_download_best, args=(url,), name="_task_download_best")
-            self.worker_threads = [thread_a, thread_b]
-            with self.best_download_lock:
-                self.best_download_thread = thread_b
+            future_a = self._submit(run_processing)
+            self.worker_futures = [future_a, future_b]
 
-            thread_a.start()
-            thread_b.start()
-
-            thread_a.join()
-            thread_b.join()
+            wait(self.worker_futures)
 
             if self.stop_flag.is_set():
                 state.add_log("Workflow stopped.")
@@ -264,15 +364,17 @@ class TaskManager:
         except Exception as e:
             state.set_status(TaskStatus.ERROR)
             state.add_log(f"Workflow Critical Error: {str(e)}")
-            import traceback
-
-            state.add_log(traceback.format_exc())
+            _log_traceback()
+            # Task B started before the 360p download; don't leave it running behind an ERROR status
+            if self._is_running(self.best_download_future):
+                self._terminate_download_process()
+                self._cleanup_download_temp_files()
         finally:
-            self.worker_threads = []
+            self.worker_futures = []
 
     def start_local_workflow(self, local_video_filename=None, local_video_source_path=None):
         """Use uploaded local video/audio file and skip download steps."""
-        if self.workflow_thread and self.workflow_thread.is_alive():
+        if self._is_running(self.workflow_future):
             state.add_log("Workflow already running.")
             return
 
@@ -298,24 +400,27 @@ class TaskManager:
             state.set_status(TaskStatus.ERROR)
             return
 
+        self.stop_flag.clear()
+
+        # Input staging runs on the worker so the HTTP handler returns immediately;
+        # mark the workflow busy first so the UI and the start/retry checks see it while copying.
+        state.set_status(TaskStatus.PROCESSING)
+        state.update_task_status("download_360p", "running")
+        self.workflow_future = self._submit(self._local_workflow_runner, source_path)
+        state.add_log("Starting local file workflow (skipping download)...")
+
+    def _local_workflow_runner(self, source_path):
+        """Local file workflow: skip download and run processing directly."""
         output_target = os.path.join("output", self.local_video_filename)
         try:
-            shutil.copy2(source_path, output_target)
+            _fast_stage(source_path, output_target)
             state.add_log(f"Prepared local input file: {self.local_video_filename}")
         except Exception as e:
             state.add_log(f"Local workflow aborted: failed to prepare input file. Reason: {e}")
+            state.update_task_status("download_360p", "error")
             state.set_status(TaskStatus.ERROR)
             return
 
-        self.stop_flag.clear()
-
-        self.workflow_thread = threading.Thread(target=self._local_workflow_runner)
-        self.workflow_thread.daemon = True
-        self.workflow_thread.start()
-        state.add_log("Starting local file workflow (skipping download)...")
-
-    def _local_workflow_runner(self):
-        """Local file workflow: skip download and run processing directly."""
         try:
             state.update_task_status("download_360p", "completed")
             state.update_task_status("download_best", "completed")
@@ -330,60 +435,34 @@ class TaskManager:
             try:
                 state.add_log("Starting Audio/Subtitle Processing...")
 
-                state.add_log("Running Whisper ASR...")
-                transcriber.transcribe()
-
-                state.add_log("Correcting English ASR tokens...")
-                english_corrector.correct_english_asr_tokens()
-
-                state.add_log("Splitting sentences (NLP)...")
-                splitter_nlp.split_by_spacy()
-
-                state.add_log("Splitting sentences (Meaning)...")
-                splitter_meaning.split_sentences_by_meaning()
-
-                state.add_log("Summarizing...")
-                summarizer.get_summary()
-
-                state.add_log("Translating...")
-                translator.translate_all()
-
-                state.add_log("Splitting for subtitles...")
-                subtitle_splitter.split_for_sub_main()
-
-                state.add_log("Aligning timestamps...")
-                subtitle_generator.align_timestamp_main()
+                self._run_processing_pipeline()
 
                 state.update_task_status("process_transcription", "completed")
                 state.set_status(TaskStatus.COMPLETED)
                 state.add_log("Local file workflow completed successfully.")
 
+            except WorkflowStopped:
+                state.add_log("Processing stopped before next step.")
             except Exception as e:
                 state.add_log(f"Processing Failed: {str(e)}")
                 state.update_task_status("process_transcription", "error")
                 state.set_status(TaskStatus.ERROR)
-                import traceback
-
-                state.add_log(traceback.format_exc())
+                _log_traceback()
 
         except Exception as e:
             state.set_status(TaskStatus.ERROR)
             state.add_log(f"Local Workflow Critical Error: {str(e)}")
-            import traceback
-
-            state.add_log(traceback.format_exc())
+            _log_traceback()
 
     def continue_workflow(self):
         """Resume workflow from previous checkpoint without cleaning workspace."""
-        if self.workflow_thread and self.workflow_thread.is_alive():
+        if self._is_running(self.workflow_future):
             state.add_log("Workflow already running.")
             return
 
         self.stop_flag.clear()
 
-        self.workflow_thread = threading.Thread(target=self._continue_runner)
-        self.workflow_thread.daemon = True
-        self.workflow_thread.start()
+        self.workflow_future = self._submit(self._continue_runner)
         state.add_log("Continuing workflow from last checkpoint...")
 
     def _continue_runner(self):
@@ -394,48 +473,24 @@ class TaskManager:
             state.add_log("Checking completed steps and resuming...")
 
             try:
-                state.add_log("Running Whisper ASR...")
-                transcriber.transcribe()
-
-                state.add_log("Correcting English ASR tokens...")
-                english_corrector.correct_english_asr_tokens()
-
-                state.add_log("Splitting sentences (NLP)...")
-                splitter_nlp.split_by_spacy()
-
-                state.add_log("Splitting sentences (Meaning)...")
-                splitter_meaning.split_sentences_by_meaning()
-
-                state.add_log("Summarizing...")
-                summarizer.get_summary()
-
-                state.add_log("Translating...")
-                translator.translate_all()
-
-                state.add_log("Splitting for subtitles...")
-                subtitle_splitter.split_for_sub_main()
-
-                state.add_log("Aligning timestamps...")
-                subtitle_generator.align_timestamp_main()
+                self._run_processing_pipeline()
 
                 state.update_task_status("process_transcription", "completed")
                 state.set_status(TaskStatus.COMPLETED)
                 state.add_log("Continue Workflow Completed.")
 
+            except WorkflowStopped:
+                state.add_log("Processing stopped before next step.")
             except Exception as e:
                 state.add_log(f"Continue Failed: {str(e)}")
                 state.update_task_status("process_transcription", "error")
                 state.set_status(TaskStatus.ERROR)
-                import traceback
-
-                state.add_log(traceback.format_exc())
+                _log_traceback()
 
         except Exception as e:
             state.set_status(TaskStatus.ERROR)
             state.add_log(f"Continue Critical Error: {str(e)}")
-            import traceback
-
-            state.add_log(traceback.format_exc())
+            _log_traceback()
 
     def burn_video(self):
         state.update_task_status("burn_video", "running")
@@ -450,7 +505,7 @@ class TaskManager:
                 state.update_task_status("burn_video", "error")
                 state.add_log(f"Burning failed: {str(e)}")
 
-        threading.Thread(target=run_burn, daemon=True).start()
+        self._submit(run_burn, stoppable=False)
 
     def reset_workspace(self, preserve_files=None):
         """
@@ -459,33 +514,62 @@ class TaskManager:
         """
         output_dir = "output"
         archive_dir = "archives"
-        preserve_set = {os.path.basename(f) for f in (preserve_files or []) if f}
+        preserve_set = frozenset(os.path.basename(f) for f in (preserve_files or []) if f)
 
         os.makedirs(output_dir, exist_ok=True)
         os.makedirs(archive_dir, exist_ok=True)
 
-        ass_file = os.path.join(output_dir, "src_trans.ass")
-        if os.path.exists(ass_file):
+        # One scan both finds the subtitles to archive and the entries to delete
+        to_archive = []
+        to_delete = []
+        try:
+            with os.scandir(output_dir) as it:
+                for entry in it:
+                    if entry.name in preserve_set:
+                        continue
+                    if entry.name.endswith(".ass") and entry.is_file(follow_symlinks=False):
+                        to_archive.append(entry)
+                    else:
+                        to_delete.append(entry)
+        except Exception as e:
+            state.add_log(f"Error scanning output directory: {e}")
+
+        if to_archive:
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            archive_path = os.path.join(archive_dir, f"{timestamp}.ass")
-            shutil.move(ass_file, archive_path)
-            state.add_log(f"Archived subtitle to {archive_path}")
+            for entry in to_archive:
+                # src_trans.ass keeps the historical "<timestamp>.ass" archive name
+                stem = os.path.splitext(entry.name)[0]
+                archive_name = f"{timestamp}.ass" if entry.name == "src_trans.ass" else f"{timestamp}_{stem}.ass"
+                archive_path = os.path.join(archive_dir, archive_name)
+                try:
+                    shutil.move(entry.path, archive_path)
+                    state.add_log(f"Archived subtitle to {archive_path}")
+                except Exception as e:
+                    state.add_log(f"Failed to archive {entry.path}. Reason: {e}")
 
         state.reset()
 
-        try:
-            for filename in os.listdir(output_dir):
-                if filename in preserve_set:
-                    continue
+        def _remove(entry):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except Exception as e:
+                state.add_log(f"Failed to delete {entry.path}. Reason: {e}")
 
-                file_path = os.path.join(output_dir, filename)
-                try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
-                        os.unlink(file_path)
-                    elif os.path.isdir(file_path):
-                        shutil.rmtree(file_path)
-                except Exception as e:
-                    state.add_log(f"Failed to delete {file_path}. Reason: {e}")
+        try:
+            # Files unlink quickly; subtrees (audio/, log/, gpt_log/) are removed in parallel
+            dirs = [entry for entry in to_delete if entry.is_dir(follow_symlinks=False)]
+            for entry in to_delete:
+                if not entry.is_dir(follow_symlinks=False):
+                    _remove(entry)
+            if len(dirs) > 1:
+                with ThreadPoolExecutor(max_workers=min(len(dirs), RESET_RMTREE_WORKERS)) as pool:
+                    list(pool.map(_remove, dirs))
+            else:
+                for entry in dirs:
+                    _remove(entry)
 
             state.add_log("Output directory cleaned.")
             if preserve_set:
@@ -1,4 +1,5 @@
 import os, subprocess
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple
 from pydub import AudioSegment
@@ -36,6 +37,66 @@ def convert_video_to_audio(video_file: str):
         ], check=True, stderr=subprocess.PIPE)
         rprint(f"[green]🎬➡️🎵 Converted <{video_file}> to <{_RAW_AUDIO_FILE}> with FFmpeg\n[/green]")
 
+ASR_SAMPLE_RATE = 16000
+# Whisper only needs 16 kHz speech; soxr's quick mode is far cheaper than the default high-quality filter
+ASR_RESAMPLE_TYPE = 'soxr_qq'
+# {(path, mtime, sr): memory-mapped mono float32 samples}; holds one decoded file at a time
+_AUDIO_CACHE = {}
+
+def _read_segment_soundfile(audio_file: str, start: float, end: float, sr: int):
+    """Seek straight to [start, end) and decode only those frames; resample just that window if needed."""
+    import soundfile as sf
+
+    with sf.SoundFile(audio_file) as f:
+        native_sr = f.samplerate
+        f.seek(int(start * native_sr))
+        frames = f.read(int((end - start) * native_sr), dtype='float32', always_2d=True)
+    audio = frames.mean(axis=1) if frames.shape[1] > 1 else frames[:, 0]
+    if native_sr != sr:
+        import librosa
+        audio = librosa.resample(audio, orig_sr=native_sr, target_sr=sr, res_type=ASR_RESAMPLE_TYPE)
+    return audio
+
+def load_audio_segment(audio_file: str, start: float, end: float, sr: int = ASR_SAMPLE_RATE):
+    """
+    Return [start, end) of audio_file as mono float32 at sr.
+    Seekable formats are read window by window; anything libsndfile can't open is decoded once and sliced.
+    """
+    try:
+        return _read_segment_soundfile(audio_file, start, end, sr)
+    except (ImportError, RuntimeError):
+        pass
+
+    key = (os.path.abspath(audio_file), os.path.getmtime(audio_file), sr)
+    audio = _AUDIO_CACHE.get(key)
+    if audio is None:
+        _AUDIO_CACHE.clear()
+        audio = _load_decoded_sidecar(audio_file, sr)
+        _AUDIO_CACHE[key] = audio
+    # Copy the window out of the read-only map so the model gets a writable, contiguous array
+    return np.array(audio[int(start * sr):int(end * sr)], dtype=np.float32)
+
+def _load_decoded_sidecar(audio_file: str, sr: int):
+    """
+    Decode audio_file once to raw float32 next to it ({audio_file}.{sr}.f32) and memory-map that file.
+    Windows page in on demand instead of keeping the whole track in RSS; a sidecar older than the source is rebuilt.
+    """
+    sidecar = f"{audio_file}.{sr}.f32"
+    if not os.path.exists(sidecar) or os.path.getmtime(sidecar) < os.path.getmtime(audio_file):
+        import librosa
+
+        audio, _ = librosa.load(audio_file, sr=sr, mono=True, res_type=ASR_RESAMPLE_TYPE)
+        tmp_path = f"{sidecar}.tmp"
+        audio.astype(np.float32, copy=False).tofile(tmp_path)
+        os.replace(tmp_path, sidecar)
+        del audio
+    if os.path.getsize(sidecar) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(sidecar, dtype=np.float32, mode='r')
+
+def clear_audio_cache():
+    _AUDIO_CACHE.clear()
+
 def get_audio_duration(audio_file: str) -> float:
     """Get the duration of an audio file using ffmpeg."""
     cmd = ['ffmpeg', '-i', audio_file]
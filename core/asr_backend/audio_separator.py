@@ -4,6 +4,7 @@
 
 import os
 import gc
+import threading
 import torch
 from rich.console import Console
 from rich import print as rprint
@@ -12,6 +13,67 @@ from core.utils.paths import _RAW_AUDIO_FILE, _VOCAL_AUDIO_FILE, _BACKGROUND_AUD
 
 console = Console()
 
+_SEPARATOR = None
+_SEPARATOR_KEY = None
+_SEPARATOR_LOCK = threading.Lock()
+
+def _load_key_or_default(key, default):
+    try:
+        return load_key(key)
+    except KeyError:
+        return default
+
+def _get_or_load_separator(Separator, model_name, model_cache_dir, use_autocast):
+    """复用已加载的分离器，只有模型/目录/精度变化时才重新加载（调用方持有 _SEPARATOR_LOCK）"""
+    global _SEPARATOR, _SEPARATOR_KEY
+    
+    key = (model_name, model_cache_dir, use_autocast)
+    if _SEPARATOR is not None and _SEPARATOR_KEY == key:
+        console.print(f"♻️ 复用已加载的 audio-separator 模型: [cyan]{model_name}[/cyan]")
+        return _SEPARATOR
+    
+    _release_separator_locked()
+    console.print(f"🤖 加载 audio-separator 模型: [cyan]{model_name}[/cyan]")
+    
+    # 初始化分离器
+    separator_kwargs = dict(
+        model_file_dir=model_cache_dir,
+        output_dir=_AUDIO_DIR,
+        output_format="MP3",
+        normalization_threshold=0.9,
+        sample_rate=44100,
+    )
+    try:
+        separator = Separator(use_autocast=use_autocast, **separator_kwargs)
+    except TypeError:
+        # 旧版 audio-separator 没有 use_autocast 参数
+        rprint("[yellow]⚠️ 当前 audio-separator 版本不支持 use_autocast，使用 fp32 推理[/yellow]")
+        separator = Separator(**separator_kwargs)
+    
+    # 加载模型
+    separator.load_model(model_filename=model_name)
+    
+    _SEPARATOR = separator
+    _SEPARATOR_KEY = key
+    return separator
+
+def _release_separator_locked():
+    global _SEPARATOR, _SEPARATOR_KEY
+    
+    if _SEPARATOR is None:
+        return
+    _SEPARATOR = None
+    _SEPARATOR_KEY = None
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+    rprint("[dim]audio-separator model released.[/dim]")
+
+def release_separator():
+    """释放常驻的分离模型（显存/内存）"""
+    with _SEPARATOR_LOCK:
+        _release_separator_locked()
+
 def audio_separator_separate():
     """使用 audio-separator 进行音频分离"""
     
@@ -33,38 +95,30 @@ def audio_separator_separate():
     # 获取配置
     model_name = load_key("audio_separator.model") or "htdemucs.yaml"
     model_cache_dir = load_key("model_dir") or "./_model_cache"
+    # GPU 上用 fp16 autocast 推理，显存带宽减半
+    use_autocast = torch.cuda.is_available() and _load_key_or_default("audio_separator.use_autocast", True)
     
-    console.print(f"🤖 加载 audio-separator 模型: [cyan]{model_name}[/cyan]")
-    
-    # 初始化分离器
-    separator = Separator(
-        model_file_dir=model_cache_dir,
-        output_dir=_AUDIO_DIR,
-        output_format="MP3",
-        normalization_threshold=0.9,
-        sample_rate=44100,
-    )
-    
-    # 加载模型
-    separator.load_model(model_filename=model_name)
-    
-    console.print("🎵 正在分离音频...")
-    
-    # 执行分离
-    output_files = separator.separate(_RAW_AUDIO_FILE)
+    with _SEPARATOR_LOCK:
+        separator = _get_or_load_separator(Separator, model_name, model_cache_dir, use_autocast)
+        
+        console.print(f"🎵 正在分离音频...{' (fp16 autocast)' if use_autocast else ''}")
+        
+        # 执行分离（推理模式下不记录 autograd 信息）
+        with torch.inference_mode():
+            output_files = separator.separate(_RAW_AUDIO_FILE)
     
     console.print(f"[dim]分离完成，输出文件: {output_files}[/dim]")
     
     # 重命名输出文件为标准名称
     _rename_output_files(output_files, model_name)
     
-    # 清理内存
-    del separator
-    gc.collect()
-    if torch.cuda.is_available():
+    # 默认分离后即释放模型，把显存留给 ASR；keep_loaded 开启时才常驻复用
+    if not _load_key_or_default("audio_separator.keep_loaded", False):
+        release_separator()
+    elif torch.cuda.is_available():
         torch.cuda.empty_cache()
     
-    # 删除 raw 和 background，只保留 vocal
+    # 删除 raw（以及旧版本遗留的 background），只保留 vocal
     if os.path.exists(_RAW_AUDIO_FILE):
         os.remove(_RAW_AUDIO_FILE)
         console.print(f"[dim]🗑️ Deleted {_RAW_AUDIO_FILE}[/dim]")
@@ -76,7 +130,7 @@ def audio_separator_separate():
 
 
 def _rename_output_files(output_files: list, model_name: str):
-    """将输出文件重命名为标准名称 (vocal.mp3, background.mp3)"""
+    """将人声文件重命名为标准名称 (vocal.mp3)，伴奏轨道直接删除"""
     
     vocal_file = None
     instrumental_files = []
@@ -102,48 +156,12 @@ def _rename_output_files(output_files: list, model_name: str):
         os.rename(vocal_file, _VOCAL_AUDIO_FILE)
         console.print(f"🎤 人声保存至: {_VOCAL_AUDIO_FILE}")
     
-    # 合并或重命名背景音乐文件
-    if instrumental_files:
-        if len(instrumental_files) == 1:
-            # 只有一个伴奏文件，直接重命名
-            if instrumental_files[0] != _BACKGROUND_AUDIO_FILE:
-                if os.path.exists(_BACKGROUND_AUDIO_FILE):
-                    os.remove(_BACKGROUND_AUDIO_FILE)
-                os.rename(instrumental_files[0], _BACKGROUND_AUDIO_FILE)
-        else:
-            # 多个背景音轨，需要混合（如 Drums + Bass + Other）
-            _mix_background_tracks(instrumental_files)
-        
-        console.print(f"🎹 背景音乐保存至: {_BACKGROUND_AUDIO_FILE}")
-
-
-def _mix_background_tracks(tracks: list):
-    """混合多个背景音轨为单个文件"""
-    try:
-        from pydub import AudioSegment
-        
-        mixed = None
-        for track in tracks:
-            audio = AudioSegment.from_file(track)
-            if mixed is None:
-                mixed = audio
-            else:
-                mixed = mixed.overlay(audio)
-            # 删除临时文件
+    # 背景音乐在分离后即被删除，不再混合多个伴奏轨道（如 Drums + Bass + Other）
+    for track in instrumental_files:
+        if os.path.exists(track):
             os.remove(track)
-        
-        if mixed:
-            mixed.export(_BACKGROUND_AUDIO_FILE, format="mp3")
-    except ImportError:
-        # 如果没有 pydub，就用第一个非人声文件
-        rprint("[yellow]⚠️ pydub 未安装，使用第一个伴奏轨道作为背景音乐[/yellow]")
-        if tracks:
-            if os.path.exists(_BACKGROUND_AUDIO_FILE):
-                os.remove(_BACKGROUND_AUDIO_FILE)
-            os.rename(tracks[0], _BACKGROUND_AUDIO_FILE)
-            # 删除其他文件
-            for t in tracks[1:]:
-                os.remove(t)
+    if instrumental_files:
+        console.print(f"[dim]🗑️ Deleted {len(instrumental_files)} instrumental track(s)[/dim]")
 
 
 if __name__ == "__main__":
@@ -16,11 +16,19 @@ import re
 import shutil
 import tempfile
 import subprocess
+import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from rich import print as rprint
 from core.utils import load_key
 
+# TextGrid (long format) 解析用正则
+_WORDS_TIER_RE = re.compile(r'name = "words".*?(?=\n\s*item \[|\Z)', re.S)
+_INTERVAL_RE = re.compile(r'xmin = ([\d.]+)\s+xmax = ([\d.]+)\s+text = "([^"]*)"')
+
+# 进程内缓存 `mfa version` 检测结果
+_MFA_AVAILABLE = False
+
 def check_mfa_available() -> bool:
     """
     检查 MFA 是否可用
@@ -28,16 +36,43 @@ def check_mfa_available() -> bool:
     Returns:
         是否可用
     """
+    global _MFA_AVAILABLE
+    
+    # `mfa version` 要导入整个 MFA 包，耗时数秒；结果在进程内缓存，只缓存成功结果以便安装后可直接重试
+    # 设置环境变量 VSUBX_FORCE_MFA=1 可跳过缓存强制重新检测
+    if _MFA_AVAILABLE and os.environ.get('VSUBX_FORCE_MFA') != '1':
+        return True
+    if shutil.which('mfa') is None:
+        return False
     try:
         result = subprocess.run(
             ['mfa', 'version'],
             capture_output=True, text=True
         )
-        return result.returncode == 0
+        _MFA_AVAILABLE = result.returncode == 0
+        return _MFA_AVAILABLE
     except Exception:
         return False
 
-def prepare_mfa_input(df: pd.DataFrame, audio_file: str, work_dir: str) -> Tuple[str, str]:
+def _link_or_copy(src: str, dst: str):
+    """MFA 只读音频：优先软链接，其次硬链接，最后才复制（如未开启开发者模式的 Windows）"""
+    try:
+        os.symlink(os.path.abspath(src), dst)
+        return
+    except (OSError, NotImplementedError):
+        pass
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    shutil.copy2(src, dst)
+
+def clean_words(df: pd.DataFrame) -> List[str]:
+    """去除 stable-ts 输出 text 两端的引号和空白（向量化 .str 操作）"""
+    return df['text'].astype(str).str.strip('"').str.strip("'").str.strip().tolist()
+
+def prepare_mfa_input(df: pd.DataFrame, audio_file: str, work_dir: str, cleaned_words: Optional[List[str]] = None) -> Tuple[str, str]:
     """
     准备 MFA 输入文件
     
@@ -45,6 +80,7 @@ def prepare_mfa_input(df: pd.DataFrame, audio_file: str, work_dir: str) -> Tuple
         df: stable-ts 输出的 DataFrame，包含 text, start, end 列
         audio_file: 音频文件路径
         work_dir: 工作目录
+        cleaned_words: 预先清理好的词列表（省略时由 df 计算）
     
     Returns:
         (音频文件路径, 文本文件路径)
@@ -53,19 +89,16 @@ def prepare_mfa_input(df: pd.DataFrame, audio_file: str, work_dir: str) -> Tuple
     input_dir = os.path.join(work_dir, 'input')
     os.makedirs(input_dir, exist_ok=True)
     
-    # 复制音频文件到输入目录（MFA 需要音频和文本在同一目录）
+    # 把音频放进输入目录（MFA 需要音频和文本在同一目录）
     audio_ext = os.path.splitext(audio_file)[1]
     audio_dest = os.path.join(input_dir, f'audio{audio_ext}')
-    shutil.copy2(audio_file, audio_dest)
+    _link_or_copy(audio_file, audio_dest)
     
     # 生成文本文件（所有词连成一个文本）
     # 清理文本中的引号（stable-ts 输出的 text 可能带引号）
-    words = []
-    for text in df['text'].tolist():
-        # 去除引号
-        clean_text = str(text).strip('"').strip("'").strip()
-        if clean_text:
-            words.append(clean_text)
+    if cleaned_words is None:
+        cleaned_words = clean_words(df)
+    words = [w for w in cleaned_words if w]
     
     transcript = ' '.join(words)
     txt_path = os.path.join(input_dir, 'audio.txt')
@@ -109,10 +142,12 @@ def run_mfa_alignment(
     
     rprint(f"[dim]   命令: mfa align ... {acoustic_model}[/dim]")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    # stdout 已由 --quiet 压缩，直接丢弃；只保留 stderr 用于报错
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace')
     
     if result.returncode != 0:
-        rprint(f"[yellow]⚠️ MFA 对齐警告: {result.stderr[:300] if result.stderr else 'unknown'}[/yellow]")
+        stderr_tail = '\n'.join(result.stderr.splitlines()[-5:]) if result.stderr else ''
+        rprint(f"[yellow]⚠️ MFA 对齐警告: {stderr_tail or 'unknown'}[/yellow]")
         # 检查输出文件是否生成（有时 MFA 返回非零但仍有输出）
         textgrid_files = [f for f in os.listdir(output_dir) if f.endswith('.TextGrid')] if os.path.exists(output_dir) else []
         if not textgrid_files:
@@ -130,57 +165,23 @@ def parse_textgrid(textgrid_path: str) -> List[Tuple[str, float, float]]:
     Returns:
         [(word, start, end), ...]
     """
-    words = []
-    
     with open(textgrid_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # 查找 words 层（MFA 输出的词层通常叫 "words"）
-    # TextGrid 格式解析
-    in_words_tier = False
-    intervals_section = False
-    current_interval = {}
-    
-    lines = content.split('\n')
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # 查找 words 层
-        if 'name = "words"' in line:
-            in_words_tier = True
-        
-        # 在 words 层中查找 intervals
-        if in_words_tier:
-            if 'intervals [' in line:
-                intervals_section = True
-                current_interval = {}
-            elif intervals_section:
-                if 'xmin = ' in line:
-                    match = re.search(r'xmin = ([\d.]+)', line)
-                    if match:
-                        current_interval['start'] = float(match.group(1))
-                elif 'xmax = ' in line:
-                    match = re.search(r'xmax = ([\d.]+)', line)
-                    if match:
-                        current_interval['end'] = float(match.group(1))
-                elif 'text = ' in line:
-                    match = re.search(r'text = "([^"]*)"', line)
-                    if match:
-                        text = match.group(1).strip()
-                        if text and 'start' in current_interval and 'end' in current_interval:
-                            words.append((text, current_interval['start'], current_interval['end']))
-                        current_interval = {}
-            
-            # 如果遇到新的 tier，停止处理
-            if 'class = "IntervalTier"' in line and in_words_tier and len(words) > 0:
-                break
-        
-        i += 1
+    # 查找 words 层（MFA 输出的词层通常叫 "words"），截取到下一个 tier 为止
+    tier_match = _WORDS_TIER_RE.search(content)
+    if not tier_match:
+        return []
     
+    # tier 头部的 xmin/xmax 后面是 "intervals: size"，不会被 interval 正则匹配
+    words = []
+    for start, end, text in _INTERVAL_RE.findall(tier_match.group(0)):
+        text = text.strip()
+        if text:
+            words.append((text, float(start), float(end)))
     return words
 
-def update_timestamps(df: pd.DataFrame, mfa_words: List[Tuple[str, float, float]]) -> pd.DataFrame:
+def update_timestamps(df: pd.DataFrame, mfa_words: List[Tuple[str, float, float]], cleaned_words: Optional[List[str]] = None) -> pd.DataFrame:
     """
     用 MFA 时间戳更新 DataFrame
     
@@ -190,6 +191,7 @@ def update_timestamps(df: pd.DataFrame, mfa_words: List[Tuple[str, float, float]
     Args:
         df: 原始 DataFrame
         mfa_words: MFA 输出的 [(word, start, end), ...]
+        cleaned_words: 预先清理好的词列表（省略时由 df 计算）
     
     Returns:
         更新后的 DataFrame
@@ -197,42 +199,36 @@ def update_timestamps(df: pd.DataFrame, mfa_words: List[Tuple[str, float, float]
     df = df.copy()
     
     # 清理 stable-ts 的文本（去除引号）
-    df['clean_text'] = df['text'].apply(lambda x: str(x).strip('"').strip("'").strip().lower())
+    if cleaned_words is None:
+        cleaned_words = clean_words(df)
+    stable_words = [w.lower() for w in cleaned_words]
     
     # MFA 词列表（小写用于匹配）
-    mfa_lower = [(w.lower(), s, e) for w, s, e in mfa_words]
+    mfa_lower = [w.lower() for w, _, _ in mfa_words]
     
-    updated_count = 0
+    # 在普通列表上做双指针匹配，只记录每个词匹配到的 MFA 下标
+    match_indices = np.full(len(stable_words), -1, dtype=np.int64)
     mfa_idx = 0
+    mfa_count = len(mfa_lower)
     
-    for i, row in df.iterrows():
-        if mfa_idx >= len(mfa_lower):
+    for i, stable_word in enumerate(stable_words):
+        if mfa_idx >= mfa_count:
             break
         
-        stable_word = row['clean_text']
-        mfa_word, mfa_start, mfa_end = mfa_lower[mfa_idx]
-        
-        # 精确匹配或近似匹配
-        if stable_word == mfa_word or stable_word in mfa_word or mfa_word in stable_word:
-            df.at[i, 'start'] = mfa_start
-            df.at[i, 'end'] = mfa_end
-            updated_count += 1
-            mfa_idx += 1
-        else:
-            # 尝试跳过 MFA 中的短词（如标点）
-            skip_count = 0
-            while mfa_idx + skip_count < len(mfa_lower) and skip_count < 3:
-                check_word, check_start, check_end = mfa_lower[mfa_idx + skip_count]
-                if stable_word == check_word or stable_word in check_word or check_word in stable_word:
-                    df.at[i, 'start'] = check_start
-                    df.at[i, 'end'] = check_end
-                    updated_count += 1
-                    mfa_idx = mfa_idx + skip_count + 1
-                    break
-                skip_count += 1
-    
-    # 清理临时列
-    df = df.drop(columns=['clean_text'])
+        # 精确匹配或近似匹配；不匹配时尝试跳过 MFA 中最多 2 个短词（如标点）
+        for check_idx in range(mfa_idx, min(mfa_idx + 3, mfa_count)):
+            check_word = mfa_lower[check_idx]
+            if stable_word == check_word or stable_word in check_word or check_word in stable_word:
+                match_indices[i] = check_idx
+                mfa_idx = check_idx + 1
+                break
+    
+    # 一次性回写匹配到的行，避免逐格 df.at
+    matched = match_indices >= 0
+    updated_count = int(matched.sum())
+    if updated_count:
+        mfa_times = np.array([(s, e) for _, s, e in mfa_words], dtype=float)
+        df.loc[matched, ['start', 'end']] = mfa_times[match_indices[matched]]
     
     rprint(f"[green]✅ MFA 时间戳更新: {updated_count}/{len(df)} 个词[/green]")
     
@@ -260,6 +256,12 @@ def align_transcription(df: pd.DataFrame, audio_file: str) -> pd.DataFrame:
         rprint("[yellow]   请运行 python install_mfa.py 安装 MFA[/yellow]")
         return df
     
+    # 没有可对齐的词时直接返回，省去临时目录、音频链接和 MFA 启动
+    cleaned_words = clean_words(df) if not df.empty else []
+    if not any(cleaned_words):
+        rprint("[yellow]⚠️ 转录文本为空，跳过 MFA 对齐[/yellow]")
+        return df
+    
     # 读取配置
     acoustic_model = load_key("mfa.acoustic_model") or "english_mfa"
     dictionary = load_key("mfa.dictionary") or "english_mfa"
@@ -270,8 +272,8 @@ def align_transcription(df: pd.DataFrame, audio_file: str) -> pd.DataFrame:
     os.makedirs(output_dir, exist_ok=True)
     
     try:
-        # 1. 准备输入
-        audio_dest, txt_path = prepare_mfa_input(df, audio_file, work_dir)
+        # 1. 准备输入（清理后的词列表在输入准备和时间戳回写之间共用）
+        audio_dest, txt_path = prepare_mfa_input(df, audio_file, work_dir, cleaned_words)
         input_dir = os.path.dirname(audio_dest)
         
         # 2. 运行 MFA 对齐
@@ -297,7 +299,7 @@ def align_transcription(df: pd.DataFrame, audio_file: str) -> pd.DataFrame:
         rprint(f"[cyan]📊 MFA 输出: {len(mfa_words)} 个词[/cyan]")
         
         # 4. 更新时间戳
-        df = update_timestamps(df, mfa_words)
+        df = update_timestamps(df, mfa_words, cleaned_words)
         
         rprint("[green]✅ MFA 对齐完成[/green]")
         return df
@@ -1,22 +1,42 @@
+import concurrent.futures
+import importlib.util
+import json
 import os
-import subprocess
+import threading
 import time
+import urllib.request
 import warnings
 from typing import Dict, Optional
 
-import librosa
+from core.utils import *
+
+MODEL_DIR = load_key("model_dir")
+
+# HF hub reads these when it is first imported, so set them before stable_whisper pulls it in.
+# Only the blob cache moves next to the other models; HF_HOME (token, config) is left alone.
+os.environ.setdefault("HF_HUB_CACHE", os.path.join(MODEL_DIR, "hf_hub"))
+if importlib.util.find_spec("hf_transfer") is not None:
+    # Multi-connection downloads; only valid when hf_transfer is installed
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
+import numpy as np
 import stable_whisper
 import torch
 from rich import print as rprint
 
-from core.utils import *
+from core.asr_backend.audio_preprocess import clear_audio_cache, load_audio_segment
 
 warnings.filterwarnings("ignore")
-MODEL_DIR = load_key("model_dir")
+HF_MIRROR_CACHE_FILE = os.path.join(MODEL_DIR, "hf_mirror.json")
+HF_MIRROR_CACHE_TTL = 24 * 3600  # Re-probe mirrors at most once a day
 
 _MODEL = None
 _MODEL_DEVICE = None
 _MODEL_SOURCE = None
+_MODEL_LOCK = threading.RLock()  # Reentrant: loading calls release_model(); also serialises transcribe/align on the shared model
+_ENCODER_COMPILED = False
+_COMPILE_CACHE_SAVED = False
+_HF_MIRROR = None
 
 
 def _count_overlong_words(result_dict: Dict, max_len: int = 30):
@@ -55,33 +75,81 @@ def _is_alignment_degraded(original_result: Dict, aligned_result: Dict):
     return False, ""
 
 
+def _read_mirror_cache(proxy: str) -> Optional[str]:
+    """Last winning mirror if it was probed < HF_MIRROR_CACHE_TTL ago with the same proxy setting."""
+    try:
+        with open(HF_MIRROR_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("proxy", "") != proxy or time.time() - float(data.get("ts", 0)) >= HF_MIRROR_CACHE_TTL:
+        return None
+    return data.get("url") or None
+
+
+def _write_mirror_cache(url: str, proxy: str):
+    try:
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        with open(HF_MIRROR_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "ts": time.time(), "proxy": proxy}, f)
+    except OSError as e:
+        rprint(f"[yellow]Failed to cache mirror choice: {e}[/yellow]")
+
+
+def _probe_mirror(url: str) -> float:
+    """HEAD the mirror root and return the round-trip time; raises on failure."""
+    start = time.time()
+    request = urllib.request.Request(url, method="HEAD")
+    with urllib.request.urlopen(request, timeout=3):
+        pass
+    return time.time() - start
+
+
 @except_handler("failed to check hf mirror", default_return=None)
 def check_hf_mirror():
+    global _HF_MIRROR
+    if _HF_MIRROR:
+        return _HF_MIRROR
+
+    proxy = load_key("proxy") or ""
+    cached_url = _read_mirror_cache(proxy)
+    if cached_url:
+        rprint(f"[cyan]Using cached mirror:[/cyan] {cached_url}")
+        _HF_MIRROR = cached_url
+        return cached_url
+
+    probed = False
     mirrors = {"Official": "huggingface.co", "Mirror": "hf-mirror.com"}
     fastest_url = f"https://{mirrors['Official']}"
-    best_time = float("inf")
 
     rprint("[cyan]Checking HuggingFace mirrors...[/cyan]")
-    for name, domain in mirrors.items():
-        if os.name == "nt":
-            cmd = ["ping", "-n", "1", "-w", "3000", domain]
-        else:
-            cmd = ["ping", "-c", "1", "-W", "3", domain]
-
-        start = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        response_time = time.time() - start
-
-        if result.returncode == 0:
-            if response_time < best_time:
-                best_time = response_time
-                fastest_url = f"https://{domain}"
+    # Probe all mirrors at once over HTTPS (ICMP ping is often blocked); the first success is the fastest
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(mirrors))
+    try:
+        futures = {
+            executor.submit(_probe_mirror, f"https://{domain}"): (name, domain)
+            for name, domain in mirrors.items()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            name, domain = futures[future]
+            try:
+                response_time = future.result()
+            except Exception:
+                continue
+            fastest_url = f"https://{domain}"
+            probed = True
             rprint(f"[green]{name}:[/green] {response_time:.2f}s")
-
-    if best_time == float("inf"):
-        rprint("[yellow]All mirrors failed, using default[/yellow]")
-
-    rprint(f"[cyan]Selected mirror:[/cyan] {fastest_url} ({best_time:.2f}s)")
+            break
+        else:
+            rprint("[yellow]All mirrors failed, using default[/yellow]")
+    finally:
+        # Don't wait for the slower probe; it finishes (or times out) in the background
+        executor.shutdown(wait=False)
+
+    rprint(f"[cyan]Selected mirror:[/cyan] {fastest_url}")
+    if probed:
+        _write_mirror_cache(fastest_url, proxy)
+    _HF_MIRROR = fastest_url
     return fastest_url
 
 
@@ -101,6 +169,73 @@ def _resolve_model_source(whisper_language: str):
     return model_name
 
 
+def _maybe_compile_encoder(model):
+    """
+    Optionally wrap the encoder in torch.compile(mode="reduce-overhead"), which replays it as a CUDA graph.
+    The encoder always sees a padded 30s mel window, so its input shape is static.
+    """
+    try:
+        enabled = bool(load_key("whisper.compile_encoder"))
+    except KeyError:
+        enabled = False
+    if not enabled:
+        return
+
+    if not hasattr(torch, "compile") or importlib.util.find_spec("triton") is None:
+        rprint("[yellow]whisper.compile_encoder needs torch>=2.0 with triton, skipping.[/yellow]")
+        return
+
+    global _ENCODER_COMPILED
+    _load_compile_cache()
+    # Compilation happens lazily on the first segment, so that one pays the warm-up cost
+    model.encoder = torch.compile(model.encoder, mode="reduce-overhead")
+    _ENCODER_COMPILED = True
+    rprint("[cyan]Whisper encoder wrapped with torch.compile (reduce-overhead).[/cyan]")
+
+
+def _compile_cache_path():
+    # Artifacts are only valid for the same torch/CUDA build and GPU architecture
+    major, minor = torch.cuda.get_device_capability()
+    key = f"{torch.__version__}_cu{torch.version.cuda}_sm{major}{minor}".replace("+", "-")
+    return os.path.join(MODEL_DIR, "compile_cache", f"{key}.bin")
+
+
+def _load_compile_cache():
+    """Preload Inductor/Triton artifacts saved by a previous process (torch>=2.7)."""
+    if not hasattr(torch.compiler, "load_cache_artifacts"):
+        return
+    path = _compile_cache_path()
+    if not os.path.exists(path):
+        return
+    try:
+        with open(path, "rb") as f:
+            torch.compiler.load_cache_artifacts(f.read())
+        rprint(f"[green]Loaded torch.compile cache:[/green] {path}")
+    except Exception as e:
+        rprint(f"[yellow]Ignoring unusable torch.compile cache {path}: {e}[/yellow]")
+
+
+def _save_compile_cache():
+    """Persist the artifacts once per process, after the first compiled forward pass."""
+    global _COMPILE_CACHE_SAVED
+    if _COMPILE_CACHE_SAVED or not hasattr(torch.compiler, "save_cache_artifacts"):
+        return
+    _COMPILE_CACHE_SAVED = True
+    try:
+        artifacts = torch.compiler.save_cache_artifacts()
+        if not artifacts:
+            return
+        path = _compile_cache_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(artifacts[0])
+        os.replace(tmp_path, path)
+        rprint(f"[dim]Saved torch.compile cache: {path}[/dim]")
+    except Exception as e:
+        rprint(f"[yellow]Failed to save torch.compile cache: {e}[/yellow]")
+
+
 def _get_or_load_model():
     global _MODEL, _MODEL_DEVICE, _MODEL_SOURCE
 
@@ -111,35 +246,68 @@ def _get_or_load_model():
     if _MODEL is not None and _MODEL_DEVICE == device and _MODEL_SOURCE == source:
         return _MODEL
 
-    # Reload if model/device/source changed
-    release_model()
-
-    mirror = check_hf_mirror()
-    if mirror:
-        os.environ["HF_ENDPOINT"] = mirror
+    with _MODEL_LOCK:
+        # Re-check: another thread may have loaded it while we waited
+        if _MODEL is not None and _MODEL_DEVICE == device and _MODEL_SOURCE == source:
+            return _MODEL
+
+        # Reload if model/device/source changed
+        release_model()
+
+        # Local models never hit the hub; otherwise probe mirrors while the CUDA context initialises
+        mirror_future = None
+        executor = None
+        if not os.path.exists(source):
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            mirror_future = executor.submit(check_hf_mirror)
+
+        try:
+            rprint(f"[cyan]Loading stable-ts model on device: {device}[/cyan]")
+            if device == "cuda":
+                torch.cuda.init()
+                gpu_mem = torch.cuda.get_device_properties(0).total_memory / (1024**3)
+                rprint(f"[cyan]GPU memory:[/cyan] {gpu_mem:.2f} GB")
+
+            mirror = mirror_future.result() if mirror_future else None
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+        if mirror:
+            os.environ["HF_ENDPOINT"] = mirror
+
+        _MODEL = stable_whisper.load_model(source, device=device, download_root=MODEL_DIR)
+        if device == "cuda":
+            _maybe_compile_encoder(_MODEL)
+        _MODEL_DEVICE = device
+        _MODEL_SOURCE = source
+        return _MODEL
 
-    rprint(f"[cyan]Loading stable-ts model on device: {device}[/cyan]")
-    if device == "cuda":
-        gpu_mem = torch.cuda.get_device_properties(0).total_memory / (1024**3)
-        rprint(f"[cyan]GPU memory:[/cyan] {gpu_mem:.2f} GB")
 
-    _MODEL = stable_whisper.load_model(source, device=device, download_root=MODEL_DIR)
-    _MODEL_DEVICE = device
-    _MODEL_SOURCE = source
-    return _MODEL
+def warm_up_model():
+    """Load the model and decode one second of silence so the first real segment skips load and kernel warm-up."""
+    # Held for the whole call so a workflow starting mid warm-up waits instead of sharing the model
+    with _MODEL_LOCK:
+        model = _get_or_load_model()
+        warm_start_time = time.time()
+        with torch.inference_mode():
+            model.transcribe(np.zeros(16000, dtype=np.float32), language="en", word_timestamps=False, verbose=None)
+    rprint(f"[cyan]stable-ts warm-up time:[/cyan] {time.time() - warm_start_time:.2f}s")
 
 
 def release_model():
-    global _MODEL, _MODEL_DEVICE, _MODEL_SOURCE
+    global _MODEL, _MODEL_DEVICE, _MODEL_SOURCE, _ENCODER_COMPILED
 
-    if _MODEL is not None:
-        del _MODEL
-        _MODEL = None
-        _MODEL_DEVICE = None
-        _MODEL_SOURCE = None
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-        rprint("[dim]stable-ts model released.[/dim]")
+    with _MODEL_LOCK:
+        if _MODEL is not None:
+            del _MODEL
+            _MODEL = None
+            _MODEL_DEVICE = None
+            _MODEL_SOURCE = None
+            _ENCODER_COMPILED = False
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            rprint("[dim]stable-ts model released.[/dim]")
+        clear_audio_cache()
 
 
 def align_words_with_stable(vocal_audio_file: str, result_dict: Dict) -> Dict:
@@ -181,33 +349,34 @@ def align_words_with_stable(vocal_audio_file: str, result_dict: Dict) -> Dict:
     # stable-ts WhisperResult(Segment(words=...)) concatenates word.word directly.
     # If upstream words are stripped (no leading spaces), text can collapse into "Comeon.Iam...".
     # For align_words we pass text-only segments to preserve original spacing semantics.
-    align_input_segments = []
-    for seg in result_dict.get("segments", []):
-        text = str(seg.get("text", "") or "")
-        if not text and seg.get("words"):
+    segments = result_dict["segments"]
+    align_input_segments = [
+        {
+            "start": float(seg.get("start", 0.0)),
+            "end": float(seg.get("end", 0.0)),
+            "text": str(seg.get("text") or "").strip(),
+        }
+        for seg in segments
+    ]
+    for seg, align_seg in zip(segments, align_input_segments):
+        if not align_seg["text"] and seg.get("words"):
             # Fallback only when text is missing: rebuild readable text with explicit spaces.
-            rebuilt = [str(w.get("word", "")).strip() for w in seg.get("words", []) if str(w.get("word", "")).strip()]
-            text = " ".join(rebuilt)
-        align_input_segments.append(
-            {
-                "start": float(seg.get("start", 0.0)),
-                "end": float(seg.get("end", 0.0)),
-                "text": text.strip(),
-            }
-        )
+            rebuilt = (str(w.get("word", "")).strip() for w in seg["words"])
+            align_seg["text"] = " ".join(w for w in rebuilt if w)
 
     try:
-        aligned_result = model.align_words(
-            vocal_audio_file,
-            align_input_segments,
-            language=language_arg,
-            vad=True,
-            vad_threshold=0.35,
-            min_word_dur=0.1,
-            suppress_silence=True,
-            only_voice_freq=True,
-            use_word_position=True,
-        )
+        with _MODEL_LOCK:
+            aligned_result = model.align_words(
+                vocal_audio_file,
+                align_input_segments,
+                language=language_arg,
+                vad=True,
+                vad_threshold=0.35,
+                min_word_dur=0.1,
+                suppress_silence=True,
+                only_voice_freq=True,
+                use_word_position=True,
+            )
     except Exception as e:
         rprint(f"[yellow]stable-ts align_words failed, keep original timestamps: {e}[/yellow]")
         return result_dict
@@ -261,29 +430,33 @@ def transcribe_audio_stable(vocal_audio_file, start, end, forced_language: Optio
     whisper_language = str(load_key("whisper.language") or "").strip().lower()
     model = _get_or_load_model()
 
-    audio_segment, _ = librosa.load(vocal_audio_file, sr=16000, offset=start, duration=end - start, mono=True)
+    audio_segment = load_audio_segment(vocal_audio_file, start, end)
 
     transcribe_start_time = time.time()
     language_arg = str(forced_language or whisper_language or "").strip().lower()
     if not language_arg or "auto" in language_arg:
         language_arg = None
 
-    result = model.transcribe(
-        audio_segment,
-        language=language_arg,
-        word_timestamps=True,
-        verbose=False,
-        regroup=False,
-        vad=True,
-        vad_threshold=0.35,
-        min_word_dur=0.1,
-        suppress_silence=True,
-        only_voice_freq=True,
-        use_word_position=True,
-    )
+    # The cached model is shared with warm_up_model; one transcribe at a time
+    with _MODEL_LOCK:
+        result = model.transcribe(
+            audio_segment,
+            language=language_arg,
+            word_timestamps=True,
+            verbose=False,
+            regroup=False,
+            vad=True,
+            vad_threshold=0.35,
+            min_word_dur=0.1,
+            suppress_silence=True,
+            only_voice_freq=True,
+            use_word_position=True,
+        )
 
     transcribe_time = time.time() - transcribe_start_time
     rprint(f"[cyan]Transcribe segment time:[/cyan] {transcribe_time:.2f}s")
+    if _ENCODER_COMPILED:
+        _save_compile_cache()
 
     result_dict = result.to_dict()
     update_key("whisper.detected_language", result_dict["language"])
@@ -291,28 +464,28 @@ def transcribe_audio_stable(vocal_audio_file, start, end, forced_language: Optio
     if result_dict["language"] == "zh" and whisper_language != "zh" and "auto" not in whisper_language:
         raise ValueError("Please specify the transcription language as zh and try again!")
 
+    # The first ASR window starts at 0, so its timestamps need no shifting
+    shift = start != 0
     for segment in result_dict["segments"]:
-        segment["start"] += start
-        segment["end"] += start
         segment["text"] = segment.get("text", "").strip()
 
-        if "words" not in segment:
-            segment["words"] = []
-
+        # One pass strips words in place and drops empty ones
         cleaned_words = []
-        for word in segment.get("words", []):
-            if "word" not in word:
-                continue
-            word["word"] = word["word"].strip()
-            if not word["word"]:
-                continue
-
-            if "start" in word:
-                word["start"] += start
-            if "end" in word:
-                word["end"] += start
-            cleaned_words.append(word)
-
+        append = cleaned_words.append
+        for word in segment.get("words", ()):
+            text = (word.get("word") or "").strip()
+            if text:
+                word["word"] = text
+                append(word)
         segment["words"] = cleaned_words
 
+        if shift:
+            segment["start"] += start
+            segment["end"] += start
+            for word in cleaned_words:
+                if "start" in word:
+                    word["start"] += start
+                if "end" in word:
+                    word["end"] += start
+
     return result_dict
@@ -0,0 +1,161 @@
+import os
+import threading
+import time
+import warnings
+from typing import Dict, Optional
+
+import torch
+from rich import print as rprint
+
+from core.asr_backend.audio_preprocess import clear_audio_cache, load_audio_segment
+from core.utils import *
+
+warnings.filterwarnings("ignore")
+MODEL_DIR = load_key("model_dir")
+
+_MODEL = None
+_MODEL_DEVICE = None
+_MODEL_SOURCE = None
+_MODEL_LOCK = threading.RLock()  # Reentrant: loading calls release_model()
+_BATCHED_PIPELINE = None
+
+
+def _resolve_compute_type(device: str) -> str:
+    # int8 weights halve memory traffic; activations stay fp16 on GPU
+    return "int8_float16" if device == "cuda" else "int8"
+
+
+def _resolve_batch_size() -> int:
+    """whisper.batch_size > 1 enables batched decoding over VAD chunks."""
+    try:
+        return max(1, int(load_key("whisper.batch_size")))
+    except Exception:
+        return 1
+
+
+def _resolve_model_source() -> str:
+    model_name = load_key("whisper.model")
+    # Local CTranslate2 conversions live next to the stable-ts models
+    local_model = os.path.join(MODEL_DIR, f"faster-whisper-{model_name}")
+    if os.path.exists(local_model):
+        rprint(f"[green]Loading local faster-whisper model:[/green] {local_model}")
+        return local_model
+
+    rprint(f"[green]Using faster-whisper model from HuggingFace:[/green] {model_name}")
+    return model_name
+
+
+def _get_or_load_model():
+    global _MODEL, _MODEL_DEVICE, _MODEL_SOURCE
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    source = _resolve_model_source()
+
+    if _MODEL is not None and _MODEL_DEVICE == device and _MODEL_SOURCE == source:
+        return _MODEL
+
+    with _MODEL_LOCK:
+        # Re-check: another thread may have loaded it while we waited
+        if _MODEL is not None and _MODEL_DEVICE == device and _MODEL_SOURCE == source:
+            return _MODEL
+
+        release_model()
+
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper is not installed! Run: pip install faster-whisper")
+
+        compute_type = _resolve_compute_type(device)
+        rprint(f"[cyan]Loading faster-whisper model on device: {device} ({compute_type})[/cyan]")
+        _MODEL = WhisperModel(source, device=device, compute_type=compute_type, download_root=MODEL_DIR)
+        _MODEL_DEVICE = device
+        _MODEL_SOURCE = source
+        return _MODEL
+
+
+def _get_batched_pipeline(model):
+    global _BATCHED_PIPELINE
+
+    if _BATCHED_PIPELINE is None or _BATCHED_PIPELINE.model is not model:
+        from faster_whisper import BatchedInferencePipeline
+
+        _BATCHED_PIPELINE = BatchedInferencePipeline(model=model)
+    return _BATCHED_PIPELINE
+
+
+def release_model():
+    global _MODEL, _MODEL_DEVICE, _MODEL_SOURCE, _BATCHED_PIPELINE
+
+    with _MODEL_LOCK:
+        if _MODEL is not None:
+            _BATCHED_PIPELINE = None
+            del _MODEL
+            _MODEL = None
+            _MODEL_DEVICE = None
+            _MODEL_SOURCE = None
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            rprint("[dim]faster-whisper model released.[/dim]")
+        clear_audio_cache()
+
+
+@except_handler("faster-whisper processing error:")
+def transcribe_audio_faster(vocal_audio_file, start, end, forced_language: Optional[str] = None) -> Dict:
+    """Same contract as transcribe_audio_stable: segment/word dicts with absolute timestamps."""
+    whisper_language = str(load_key("whisper.language") or "").strip().lower()
+    model = _get_or_load_model()
+
+    audio_segment = load_audio_segment(vocal_audio_file, start, end)
+
+    transcribe_start_time = time.time()
+    language_arg = str(forced_language or whisper_language or "").strip().lower()
+    if not language_arg or "auto" in language_arg:
+        language_arg = None
+
+    transcribe_kwargs = dict(
+        language=language_arg,
+        word_timestamps=True,
+        vad_filter=True,
+        vad_parameters={"threshold": 0.35},
+    )
+    batch_size = _resolve_batch_size()
+    if batch_size > 1:
+        # Silero VAD cuts the audio into <=30s chunks that are decoded batch_size at a time
+        segments, info = _get_batched_pipeline(model).transcribe(audio_segment, batch_size=batch_size, **transcribe_kwargs)
+    else:
+        segments, info = model.transcribe(audio_segment, **transcribe_kwargs)
+
+    result_dict = {"language": info.language, "segments": []}
+    for segment in segments:
+        words = []
+        for word in segment.words or []:
+            text = word.word.strip()
+            if not text:
+                continue
+            words.append(
+                {
+                    "word": text,
+                    "start": word.start + start,
+                    "end": word.end + start,
+                    "probability": word.probability,
+                }
+            )
+        result_dict["segments"].append(
+            {
+                "start": segment.start + start,
+                "end": segment.end + start,
+                "text": segment.text.strip(),
+                "words": words,
+            }
+        )
+
+    transcribe_time = time.time() - transcribe_start_time
+    rprint(f"[cyan]Transcribe segment time:[/cyan] {transcribe_time:.2f}s")
+
+    update_key("whisper.detected_language", result_dict["language"])
+
+    if result_dict["language"] == "zh" and whisper_language != "zh" and "auto" not in whisper_language:
+        raise ValueError("Please specify the transcription language as zh and try again!")
+
+    return result_dict
@@ -1,17 +1,28 @@
 import os,sys
-import glob
+import functools
+from contextlib import nullcontext
 import re
 import subprocess
+import tempfile
+import threading
 import time
 from core.utils import *
 
+# Task B now starts alongside the 360p download; never run two pip upgrades at once
+_UPDATE_LOCK = threading.Lock()
+# yt-dlp 自动更新最多每天一次，时间记录在临时目录的标记文件上
+YTDLP_UPDATE_MARKER = os.path.join(tempfile.gettempdir(), '.ytdlp_upgraded')
+YTDLP_UPDATE_INTERVAL = 24 * 3600
+# yt-dlp keeps per-stream files ("title_best.f137.mp4") and a ".temp" file until the merge ends
+_FORMAT_FRAGMENT_RE = re.compile(r'\.(?:f\d+|temp)$')
+_ILLEGAL_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+_DOWNLOAD_TEMP_SUFFIXES = ('.part', '.ytdl')
+
 def sanitize_filename(filename):
-    # Remove or replace illegal characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
-    # Ensure filename doesn't start or end with a dot or space
-    filename = filename.strip('. ')
+    # Remove illegal characters, then ensure filename doesn't start or end with a dot or space
+    filename = _ILLEGAL_FILENAME_RE.sub('', filename).strip('. ')
     # Use default name if filename is empty
-    return filename if filename else 'video'
+    return filename or 'video'
 
 def update_ytdlp():
     """
@@ -19,10 +30,55 @@ def update_ytdlp():
     1. 如果配置了代理，使用代理更新
     2. 如果没有代理，检测官方 PyPI 是否可访问
     3. 如果不可访问，使用清华镜像更新
+    4. 每天最多更新一次，auto_update_ytdlp: false 时完全跳过
     """
-    import urllib.request
+    with _UPDATE_LOCK:
+        if _ytdlp_update_due():
+            _update_ytdlp_locked()
+            # 无论成功与否都记录，避免网络不通时每次下载都重试 pip
+            _touch(YTDLP_UPDATE_MARKER)
+        from yt_dlp import YoutubeDL
+        return YoutubeDL
+
+def _ytdlp_update_due():
+    """auto_update_ytdlp 关闭时不更新；否则每 YTDLP_UPDATE_INTERVAL 秒最多更新一次"""
+    try:
+        if not load_key("auto_update_ytdlp"):
+            return False
+    except KeyError:
+        pass
+    try:
+        return time.time() - os.path.getmtime(YTDLP_UPDATE_MARKER) >= YTDLP_UPDATE_INTERVAL
+    except OSError:
+        return True
+
+def _touch(path):
+    try:
+        with open(path, 'a'):
+            pass
+        os.utime(path, None)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=1)
+def _can_reach_pypi():
+    """检测是否能访问官方 PyPI（HEAD 请求，进程内只检测一次）"""
     import socket
-    
+    import urllib.error
+    import urllib.request
+
+    try:
+        req = urllib.request.Request(
+            "https://pypi.org/simple/yt-dlp/",
+            headers={"User-Agent": "pip/23.0"},
+            method="HEAD",
+        )
+        urllib.request.urlopen(req, timeout=5).close()
+        return True
+    except (urllib.error.URLError, socket.timeout):
+        return False
+
+def _update_ytdlp_locked():
     proxy = load_key("proxy")
     
     # 构建 pip 命令的基础参数
@@ -34,19 +90,7 @@ def update_ytdlp():
         pip_args.extend(["--proxy", proxy])
     else:
         # 无代理，检测网络
-        def can_reach_pypi():
-            """检测是否能访问官方 PyPI"""
-            try:
-                req = urllib.request.Request(
-                    "https://pypi.org/simple/yt-dlp/",
-                    headers={"User-Agent": "pip/23.0"}
-                )
-                urllib.request.urlopen(req, timeout=5)
-                return True
-            except (urllib.error.URLError, socket.timeout):
-                return False
-        
-        if can_reach_pypi():
+        if _can_reach_pypi():
             rprint("[blue]检测到可访问 PyPI，使用官方源更新 yt-dlp...[/blue]")
         else:
             # 使用清华镜像
@@ -60,9 +104,6 @@ def update_ytdlp():
         rprint("[green]yt-dlp 更新成功[/green]")
     except subprocess.CalledProcessError as e:
         rprint(f"[yellow]警告: yt-dlp 更新失败: {e}[/yellow]")
-    
-    from yt_dlp import YoutubeDL
-    return YoutubeDL
 
 def download_video_ytdlp(url, save_path='output', resolution='1080', suffix='', max_retries=2, retry_delay=2):
     os.makedirs(save_path, exist_ok=True)
@@ -102,13 +143,107 @@ def download_video_ytdlp(url, save_path='output', resolution='1080', suffix='',
             if wait_seconds > 0:
                 time.sleep(wait_seconds)
     
-    # Check and rename files after download
-    for file in os.listdir(save_path):
-        if os.path.isfile(os.path.join(save_path, file)):
-            filename, ext = os.path.splitext(file)
-            new_filename = sanitize_filename(filename)
-            if new_filename != filename:
-                os.rename(os.path.join(save_path, file), os.path.join(save_path, new_filename + ext))
+    sanitize_downloaded_files(save_path)
+
+def _is_download_in_progress(name):
+    # .part/.ytdl files and per-format/merge intermediates belong to a yt-dlp run that is still writing
+    return name.endswith(_DOWNLOAD_TEMP_SUFFIXES) or bool(_FORMAT_FRAGMENT_RE.search(os.path.splitext(name)[0]))
+
+def sanitize_downloaded_files(save_path='output'):
+    """
+    Check and rename finished downloads.
+    The 360p and best-quality downloads share save_path, so files another yt-dlp run is still
+    writing are left alone, and a file the other run already renamed is skipped.
+    """
+    with os.scandir(save_path) as it:
+        entries = [entry for entry in it if entry.is_file(follow_symlinks=False) and not _is_download_in_progress(entry.name)]
+    # Rename after the scan finishes so the directory isn't modified while iterating it
+    for entry in entries:
+        filename, ext = os.path.splitext(entry.name)
+        new_filename = sanitize_filename(filename)
+        if new_filename != filename:
+            try:
+                os.rename(entry.path, os.path.join(save_path, new_filename + ext))
+            except FileNotFoundError:
+                pass
+
+def build_ytdlp_command(url, save_path='output', resolution='1080', suffix=''):
+    """yt-dlp CLI equivalent of the ydl_opts used by download_video_ytdlp"""
+    cmd = [
+        sys.executable, "-m", "yt_dlp",
+        "-f", 'bestvideo+bestaudio/best' if resolution == 'best' else 'worstvideo+bestaudio/best',
+        "-o", f'{save_path}/%(title)s{suffix}.%(ext)s',
+        "--no-playlist",
+        "--write-thumbnail",
+        "--convert-thumbnails", "jpg",
+        "--remote-components", "ejs:github",
+        "--newline",
+    ]
+    proxy = load_key("proxy")
+    if proxy:
+        cmd.extend(["--proxy", proxy])
+    cookies_path = load_key("youtube.cookies_path")
+    if os.path.exists(cookies_path):
+        cmd.extend(["--cookies", str(cookies_path)])
+    cmd.append(url)
+    return cmd
+
+class DownloadCancelled(RuntimeError):
+    """Raised by download_video_subprocess when its cancel_event was set."""
+
+def download_video_subprocess(url, save_path='output', resolution='1080', suffix='', max_retries=2, retry_delay=2, on_process=None, cancel_event=None):
+    """
+    Run yt-dlp in a child process and stream its output line by line.
+    on_process(proc) is called for every attempt so callers can terminate the download.
+    cancel_event (threading.Event) marks a deliberate stop: once set, no further attempt is made
+    and DownloadCancelled is raised, whatever exit code the terminated process reported
+    (on Windows terminate() leaves 1, not a negative signal number).
+    """
+    def _cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    os.makedirs(save_path, exist_ok=True)
+    update_ytdlp()
+    cmd = build_ytdlp_command(url, save_path, resolution, suffix)
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+
+    total_attempts = max(1, int(max_retries) + 1)
+    for attempt in range(1, total_attempts + 1):
+        if _cancelled():
+            raise DownloadCancelled("Download cancelled")
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=env,
+        )
+        if on_process:
+            on_process(proc)
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                print(line)
+        returncode = proc.wait()
+        if _cancelled():
+            raise DownloadCancelled(f"Download cancelled (yt-dlp exited with code {returncode})")
+        if returncode == 0:
+            break
+        if attempt >= total_attempts:
+            raise RuntimeError(f"yt-dlp exited with code {returncode}")
+        wait_seconds = max(0, int(retry_delay)) * attempt
+        rprint(f"[yellow]Download failed (attempt {attempt}/{total_attempts}): yt-dlp exited with code {returncode}[/yellow]")
+        rprint(f"[blue]Retrying download in {wait_seconds}s...[/blue]")
+        if wait_seconds > 0:
+            # Sleep on the event so a stop during the back-off is seen immediately
+            if cancel_event is not None:
+                cancel_event.wait(wait_seconds)
+            else:
+                time.sleep(wait_seconds)
+
+    sanitize_downloaded_files(save_path)
 
 def download_video_async(url, save_path='output', resolution='1080', suffix=''):
     """异步下载视频，用于并行处理"""
@@ -124,11 +259,23 @@ def download_video_async(url, save_path='output', resolution='1080', suffix=''):
     return thread
 
 def find_video_files(save_path='output', prefer_best=True):
-    video_files = [file for file in glob.glob(save_path + "/*") if os.path.splitext(file)[1][1:].lower() in load_key("allowed_video_formats")]
-    # change \\ to /, this happen on windows
-    if sys.platform.startswith('win'):
-        video_files = [file.replace("\\", "/") for file in video_files]
-    video_files = [file for file in video_files if not file.startswith("output/output")]
+    allowed_formats = set(load_key("allowed_video_formats"))
+    video_files = []
+    # One scandir pass; paths use "/" on every platform, and dotfiles are skipped like glob("*") did
+    with os.scandir(save_path) if os.path.isdir(save_path) else nullcontext(()) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            stem, ext = os.path.splitext(entry.name)
+            if ext[1:].lower() not in allowed_formats:
+                continue
+            file = f"{save_path}/{entry.name}"
+            if file.startswith("output/output"):
+                continue
+            # Skip unmerged stream fragments of a download that is still running
+            if _FORMAT_FRAGMENT_RE.search(stem):
+                continue
+            video_files.append(file)
     
     if len(video_files) == 0:
         raise ValueError("No video files found in the output directory.")
@@ -136,11 +283,15 @@ def find_video_files(save_path='output', prefer_best=True):
     if len(video_files) == 1:
         return video_files[0]
     
-    # If multiple videos found, prioritize best quality
+    # If multiple videos found, prioritize best quality (or the low-res copy when prefer_best=False)
+    best_files = [f for f in video_files if '_best.' in f or 'best.' in f]
     if prefer_best:
-        best_files = [f for f in video_files if '_best.' in f or 'best.' in f]
         if best_files:
             return best_files[0]
+    else:
+        other_files = [f for f in video_files if f not in best_files]
+        if other_files:
+            return other_files[0]
     
     # Otherwise return the first one
     return video_files[0]
@@ -1,23 +1,54 @@
+import concurrent.futures
+import csv
+import itertools
 import json
 import os
+import shutil
+from collections import deque
 from datetime import datetime
 from typing import Dict, List
 
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
 from core.prompts import get_english_correction_prompt
 from core.utils import ask_gpt, load_key, rprint
 from core.utils.paths import _2_CLEANED_CHUNKS
 
-_COLLOQUIAL_FORMS = {
-    "gonna",
-    "wanna",
-    "gotta",
-    "kinda",
-    "sorta",
-    "ain't",
-    "y'all",
-}
+_COLLOQUIAL_FORMS = frozenset(
+    {
+        "gonna",
+        "wanna",
+        "gotta",
+        "kinda",
+        "sorta",
+        "ain't",
+        "y'all",
+    }
+)
+_ACCEPTED_CONFIDENCE = frozenset({"high", "very_high", "very high"})
+# Changelog column order; every audit record carries exactly these keys
+_AUDIT_COLUMNS = (
+    "run_id",
+    "status",
+    "skip_reason",
+    "start_key",
+    "source",
+    "target",
+    "confidence",
+    "type",
+    "reason",
+    "row_index",
+    "row_start",
+    "before",
+    "after",
+)
+# Bound format method shared by the prompt tokens and the row lookup, so both sides always produce the same key
+_format_start_key = "{:.6f}".format
 
 
 def _load_key_or_default(key, default):
@@ -36,31 +67,35 @@ def _load_bool_key(key, default=False):
     return bool(value)
 
 
-def _start_key(value) -> str:
-    try:
-        return f"{float(value):.6f}"
-    except Exception:
-        return str(value)
-
-
 def _normalize_word(text: str) -> str:
     return str(text).strip().strip('"').strip()
 
 
+def _normalize_word_series(text: pd.Series) -> pd.Series:
+    """Vectorised _normalize_word."""
+    return text.astype(str).str.strip().str.strip('"').str.strip()
+
+
 def _build_tokens(df: pd.DataFrame) -> List[Dict]:
-    tokens = []
-    for _, row in df.iterrows():
-        word = _normalize_word(row["text"])
-        if not word:
-            continue
-        tokens.append(
-            {
-                "start_key": _start_key(row["start"]),
-                "start": float(row["start"]),
-                "word": word,
-            }
-        )
-    return tokens
+    words = _normalize_word_series(df["text"])
+    mask = words.ne("")
+    starts = df["start"].astype(float)[mask].tolist()
+    start_keys = map(_format_start_key, starts)
+    return [
+        {"start_key": key, "start": start, "word": word}
+        for key, start, word in zip(start_keys, starts, words[mask].tolist())
+    ]
+
+
+def _dump_tokens(tokens: List[Dict]) -> str:
+    # orjson emits UTF-8 like ensure_ascii=False, so both paths give the same prompt text
+    if orjson is not None:
+        return orjson.dumps(tokens, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(tokens, ensure_ascii=False, indent=2)
+
+
+def _chunk_tokens(tokens: List[Dict], size: int) -> List[List[Dict]]:
+    return [tokens[i:i + size] for i in range(0, len(tokens), size)]
 
 
 def _get_correction_api_settings() -> Dict:
@@ -92,15 +127,32 @@ def _valid_correction_response(response_data):
 
 
 def _apply_corrections(df: pd.DataFrame, corrections: List[Dict], run_id: str):
+    # Rows are tracked by position; plain lists avoid the label indexer on every lookup
+    start_keys = list(map(_format_start_key, df["start"].astype(float).tolist()))
+    row_labels = df.index.tolist()
+    # Rows sharing a start key are consumed front to back, so the head of each deque is the first unused row
     start_to_indices = {}
-    for idx, row in df.iterrows():
-        key = _start_key(row["start"])
-        start_to_indices.setdefault(key, []).append(idx)
+    for pos, key in enumerate(start_keys):
+        start_to_indices.setdefault(key, deque()).append(pos)
+    # Each row is replaced at most once, so the pre-correction text stays valid for every check
+    current_words = _normalize_word_series(df["text"]).tolist()
+
+    # The LLM sometimes repeats a suggestion for the same token; keep the first one only
+    seen = set()
+    unique_corrections = []
+    for item in corrections:
+        key = (str(item.get("start_key", "")).strip(), _normalize_word(item.get("source", "")))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_corrections.append(item)
+    if len(unique_corrections) < len(corrections):
+        rprint(f"[dim]Dropped {len(corrections) - len(unique_corrections)} duplicate English correction(s).[/dim]")
 
-    used_indices = set()
+    pending = []
     applied_count = 0
     audit_rows = []
-    for item in corrections:
+    for item in unique_corrections:
         start_key = str(item.get("start_key", "")).strip()
         source = _normalize_word(item.get("source", ""))
         target = _normalize_word(item.get("target", ""))
@@ -137,44 +189,48 @@ def _apply_corrections(df: pd.DataFrame, corrections: List[Dict], run_id: str):
             record["skip_reason"] = "non_token_replacement"
             audit_rows.append(record)
             continue
-        if source.lower() in _COLLOQUIAL_FORMS:
+        if source.casefold() in _COLLOQUIAL_FORMS:
             # Hard guard: do not normalize spoken colloquial forms.
             record["skip_reason"] = "colloquial_form_guard"
             audit_rows.append(record)
             continue
         # If confidence is provided, apply only high confidence corrections.
-        if confidence and confidence not in {"high", "very_high", "very high"}:
+        if confidence and confidence not in _ACCEPTED_CONFIDENCE:
             record["skip_reason"] = "low_confidence"
             audit_rows.append(record)
             continue
 
-        candidates = start_to_indices.get(start_key, [])
-        idx = next((x for x in candidates if x not in used_indices), None)
+        candidates = start_to_indices.get(start_key)
+        idx = candidates[0] if candidates else None
         if idx is None:
             record["skip_reason"] = "start_key_not_found_or_already_used"
             audit_rows.append(record)
             continue
 
-        current = _normalize_word(df.at[idx, "text"])
+        current = current_words[idx]
         if current != source:
             # Safety gate: only replace exact source token.
             record["skip_reason"] = "source_mismatch_with_current_token"
-            record["row_index"] = int(idx)
-            record["row_start"] = _start_key(df.at[idx, "start"])
+            record["row_index"] = int(row_labels[idx])
+            record["row_start"] = start_keys[idx]
             record["before"] = current
             audit_rows.append(record)
             continue
 
-        df.at[idx, "text"] = f'"{target}"'
-        used_indices.add(idx)
+        pending.append((idx, f'"{target}"'))
+        candidates.popleft()
         applied_count += 1
         record["status"] = "applied"
-        record["row_index"] = int(idx)
-        record["row_start"] = _start_key(df.at[idx, "start"])
+        record["row_index"] = int(row_labels[idx])
+        record["row_start"] = start_keys[idx]
         record["before"] = current
         record["after"] = target
         audit_rows.append(record)
 
+    if pending:
+        pending_indices, pending_texts = zip(*pending)
+        df.iloc[list(pending_indices), df.columns.get_loc("text")] = list(pending_texts)
+
     return applied_count, audit_rows
 
 
@@ -183,10 +239,15 @@ def _write_changelog(rows: List[Dict]):
         return None
     log_path = "output/log/english_correction_changelog.csv"
     os.makedirs(os.path.dirname(log_path), exist_ok=True)
-    df_log = pd.DataFrame(rows)
-    df_log.insert(0, "logged_at", datetime.now().isoformat(timespec="seconds"))
-    file_exists = os.path.exists(log_path)
-    df_log.to_csv(log_path, mode="a", header=not file_exists, index=False, encoding="utf-8-sig")
+    logged_at = datetime.now().isoformat(timespec="seconds")
+    # Create/open in one call and decide on the header from the open fd, not a separate exists() check
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    need_header = os.fstat(fd).st_size == 0
+    with os.fdopen(fd, "a", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, lineterminator="\n")  # same line endings as the old to_csv output
+        if need_header:
+            writer.writerow(("logged_at", *_AUDIT_COLUMNS))
+        writer.writerows((logged_at, *(row[col] for col in _AUDIT_COLUMNS)) for row in rows)
     return log_path
 
 
@@ -214,28 +275,32 @@ def correct_english_asr_tokens():
         rprint("[dim]English correction skipped (no valid tokens).[/dim]")
         return
 
-    tokens_json = json.dumps(tokens, ensure_ascii=False, indent=2)
-    prompt = get_english_correction_prompt(tokens_json)
-    rprint(f"[cyan]Running English ASR correction on {len(tokens)} tokens...[/cyan]")
-
-    response = ask_gpt(
-        prompt,
-        resp_type="json",
-        valid_def=_valid_correction_response,
-        log_title="english_correction",
-        api_settings=_get_correction_api_settings(),
-    )
-    corrections = response.get("corrections", [])
+    # Long transcripts are split into windows so each prompt stays small and windows run concurrently
+    chunk_size = max(1, int(_load_key_or_default("english_correction.chunk_size", 400)))
+    max_concurrency = _load_key_or_default("english_correction.max_concurrency", None) or load_key("max_workers")
+    max_concurrency = max(1, int(max_concurrency))
+    chunks = _chunk_tokens(tokens, chunk_size)
+    api_settings = _get_correction_api_settings()
+    rprint(f"[cyan]Running English ASR correction on {len(tokens)} tokens in {len(chunks)} chunk(s)...[/cyan]")
+
+    def _correct_chunk(chunk: List[Dict]) -> List[Dict]:
+        tokens_json = _dump_tokens(chunk)
+        response = ask_gpt(
+            get_english_correction_prompt(tokens_json),
+            resp_type="json",
+            valid_def=_valid_correction_response,
+            log_title="english_correction",
+            api_settings=api_settings,
+        )
+        return response.get("corrections", [])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_concurrency, len(chunks))) as executor:
+        # map keeps chunk order, so corrections stay in transcript order
+        corrections = list(itertools.chain.from_iterable(executor.map(_correct_chunk, chunks)))
     if not corrections:
         rprint("[green]No English ASR corrections suggested.[/green]")
         return
 
-    backup_path = "output/log/cleaned_chunks_before_english_correction.xlsx"
-    if not os.path.exists(backup_path):
-        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
-        df.to_excel(backup_path, index=False)
-        rprint(f"[dim]Backup created: {backup_path}[/dim]")
-
     run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
     applied, audit_rows = _apply_corrections(df, corrections, run_id=run_id)
     log_path = _write_changelog(audit_rows)
@@ -246,6 +311,16 @@ def correct_english_asr_tokens():
         rprint("[yellow]English corrections returned, but no safe replacements were applied.[/yellow]")
         return
 
+    # Only back up when the file is about to change; the xlsx on disk is still the pre-correction version
+    backup_path = "output/log/cleaned_chunks_before_english_correction.xlsx"
+    if not os.path.exists(backup_path):
+        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+        # Copy then rename: a half-written backup would otherwise block every later backup.
+        tmp_path = f"{backup_path}.tmp"
+        shutil.copyfile(_2_CLEANED_CHUNKS, tmp_path)
+        os.replace(tmp_path, backup_path)
+        rprint(f"[dim]Backup created: {backup_path}[/dim]")
+
     df.to_excel(_2_CLEANED_CHUNKS, index=False)
     rprint(f"[green]Applied {applied} English token corrections to {_2_CLEANED_CHUNKS}[/green]")
 
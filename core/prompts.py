@@ -1,6 +1,17 @@
 import json
 from core.utils import *
 
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+def _dump_skeleton(obj):
+    """JSON answer skeleton for the translation prompts; orjson output is identical to json.dumps(indent=2, ensure_ascii=False)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
 ## ================================================================
 # @ step4_splitbymeaning.py
 def get_split_prompt(sentence, num_parts = 2, word_limit = 20):
@@ -264,7 +275,7 @@ def get_prompt_faithfulness(lines, shared_prompt):
     json_dict = {}
     for i, line in enumerate(line_splits, 1):
         json_dict[f"{i}"] = {"origin": line, "direct": f"direct {TARGET_LANGUAGE} translation {i}."}
-    json_format = json.dumps(json_dict, indent=2, ensure_ascii=False)
+    json_format = _dump_skeleton(json_dict)
 
     src_language = load_key("whisper.detected_language")
     prompt_faithfulness = f'''
@@ -313,7 +324,7 @@ def get_prompt_expressiveness(faithfulness_result, lines, shared_prompt):
         }
         for key, value in faithfulness_result.items()
     }
-    json_format = json.dumps(json_format, indent=2, ensure_ascii=False)
+    json_format = _dump_skeleton(json_format)
 
     src_language = load_key("whisper.detected_language")
     prompt_expressiveness = f'''
@@ -395,16 +406,16 @@ Note: Start you answer with ```json and end with ```, do not add any other text.
 
 def get_prompt_single_pass(lines, shared_prompt):
     TARGET_LANGUAGE = load_key("target_language")
-    line_splits = lines.split('\n')
-    json_format = {}
-    for i, line in enumerate(line_splits, 1):
-        json_format[f"{i}"] = {
+    json_format = {
+        f"{i}": {
             "origin": line,
             "direct": f"faithful {TARGET_LANGUAGE} translation {i}",
             "reflect": "brief reflection on wording and structure",
             "free": f"natural and concise {TARGET_LANGUAGE} subtitle {i}",
         }
-    json_format = json.dumps(json_format, indent=2, ensure_ascii=False)
+        for i, line in enumerate(lines.split('\n'), 1)
+    }
+    json_format = _dump_skeleton(json_format)
 
     src_language = load_key("whisper.detected_language")
     prompt_single_pass = f'''
@@ -545,14 +556,14 @@ def get_align_prompt(src_sub, tr_sub, src_part):
     targ_lang = load_key("target_language")
     src_lang = load_key("whisper.detected_language")
     src_splits = src_part.split('\n')
-    num_parts = len(src_splits)
-    src_part = src_part.replace('\n', ' [br] ')
-    align_parts_json = ','.join(
-        f'''
-        {{
-            "src_part_{i+1}": "{src_splits[i]}",
-            "target_part_{i+1}": "Corresponding aligned {targ_lang} subtitle part"
-        }}''' for i in range(num_parts)
+    src_part = ' [br] '.join(src_splits)
+    # json.dumps escapes quotes/backslashes inside subtitle text, which the hand-written template did not
+    align_parts_json = ',\n        '.join(
+        json.dumps(
+            {f"src_part_{i}": split, f"target_part_{i}": f"Corresponding aligned {targ_lang} subtitle part"},
+            ensure_ascii=False,
+        )
+        for i, split in enumerate(src_splits, 1)
     )
 
     align_prompt = f'''
@@ -2,7 +2,6 @@ import concurrent.futures
 from difflib import SequenceMatcher
 import math
 from core.prompts import get_split_prompt
-from core.spacy_utils.load_nlp_model import init_nlp
 from core.utils import *
 from rich.console import Console
 from rich.table import Table
@@ -80,32 +79,46 @@ def split_sentence(sentence, num_parts, word_limit=20, index=-1, retry_attempt=0
     
     return best_split
 
-def parallel_split_sentences(sentences, max_length, max_workers, nlp, retry_attempt=0):
-    """Split sentences in parallel using a thread pool."""
-    new_sentences = [None] * len(sentences)
-    futures = []
+def parallel_split_sentences(sentences, max_length, max_workers, nlp, max_attempts=3):
+    """
+    Split sentences in parallel using a thread pool.
+    A part that is still too long is resubmitted as soon as its own split returns,
+    so retries overlap with the first attempts instead of waiting for a full pass.
+    """
+    pieces = {}
+    pending = {}
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for index, sentence in enumerate(sentences):
-            # Use tokenizer to split the sentence
+        def schedule(key, sentence, retry_attempt):
+            if retry_attempt >= max_attempts:
+                pieces[key] = sentence
+                return
+            # Use tokenizer to split the sentence (spaCy stays on this thread)
             tokens = tokenize_sentence(sentence, nlp)
-            # print("Tokenization result:", tokens)
+            if len(tokens) <= max_length:
+                pieces[key] = sentence
+                return
             num_parts = math.ceil(len(tokens) / max_length)
-            if len(tokens) > max_length:
-                future = executor.submit(split_sentence, sentence, num_parts, max_length, index=index, retry_attempt=retry_attempt)
-                futures.append((future, index, num_parts, sentence))
-            else:
-                new_sentences[index] = [sentence]
-
-        for future, index, num_parts, sentence in futures:
-            split_result = future.result()
-            if split_result:
-                split_lines = split_result.strip().split('\n')
-                new_sentences[index] = [line.strip() for line in split_lines]
-            else:
-                new_sentences[index] = [sentence]
-
-    return [sentence for sublist in new_sentences for sentence in sublist]
+            future = executor.submit(split_sentence, sentence, num_parts, max_length, index=key[0], retry_attempt=retry_attempt)
+            pending[future] = (key, sentence, retry_attempt)
+
+        for index, sentence in enumerate(sentences):
+            schedule((index,), sentence, 0)
+
+        while pending:
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                key, sentence, retry_attempt = pending.pop(future)
+                split_result = future.result()
+                if split_result:
+                    split_lines = [line.strip() for line in split_result.strip().split('\n')]
+                else:
+                    split_lines = [sentence]
+                # key is the path of sub-indices, so sorting the keys restores the original order
+                for sub_index, line in enumerate(split_lines):
+                    schedule(key + (sub_index,), line, retry_attempt + 1)
+
+    return [pieces[key] for key in sorted(pieces)]
 
 @check_file_exists(_3_2_SPLIT_BY_MEANING)
 def split_sentences_by_meaning():
@@ -114,10 +127,12 @@ def split_sentences_by_meaning():
     with open(_3_1_SPLIT_BY_NLP, 'r', encoding='utf-8') as f:
         sentences = [line.strip() for line in f.readlines()]
 
+    # spaCy 延迟到真正分句时才导入，避免拖慢服务启动
+    from core.spacy_utils.load_nlp_model import init_nlp
+
     nlp = init_nlp()
-    # 🔄 process sentences multiple times to ensure all are split
-    for retry_attempt in range(3):
-        sentences = parallel_split_sentences(sentences, max_length=load_key("max_split_length"), max_workers=load_key("max_workers"), nlp=nlp, retry_attempt=retry_attempt)
+    # 🔄 up to 3 split attempts per sentence to ensure all are split
+    sentences = parallel_split_sentences(sentences, max_length=load_key("max_split_length"), max_workers=load_key("max_workers"), nlp=nlp, max_attempts=3)
 
     # 💾 save results
     with open(_3_2_SPLIT_BY_MEANING, 'w', encoding='utf-8') as f:
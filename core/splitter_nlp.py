@@ -1,10 +1,12 @@
-from core.spacy_utils import rough_split, init_nlp
 from core.rough_split_entity_repair import repair_rough_split_entities
 from core.utils.paths import _3_1_SPLIT_BY_NLP
 from core.utils import check_file_exists
 
 @check_file_exists(_3_1_SPLIT_BY_NLP)
 def split_by_spacy():
+    # spaCy 延迟到真正分句时才导入，避免拖慢服务启动
+    from core.spacy_utils import rough_split, init_nlp
+
     nlp = init_nlp()
     rough_split(nlp)
 
@@ -10,7 +10,6 @@ from core.asr_backend.audio_preprocess import (
     save_results,
     split_audio,
 )
-from core.asr_backend.audio_separator import separate_audio
 from core.downloader import find_video_files
 from core.utils import *
 from core.utils.paths import *
@@ -114,10 +113,14 @@ def _resolve_alignment_mode() -> Tuple[int, str]:
 def transcribe():
     # 1) Ensure source audio exists
     if not os.path.exists(_VOCAL_AUDIO_FILE):
-        video_file = find_video_files()
+        # ASR only needs the 360p copy; Task B's _best file may already be merged by now
+        video_file = find_video_files(prefer_best=False)
         convert_video_to_audio(video_file)
 
     # 2) Always use audio-separator and then normalize vocals
+    # Imported here so torch only loads once a workflow actually transcribes
+    from core.asr_backend.audio_separator import separate_audio
+
     separate_audio()
     vocal_audio = normalize_audio_volume(_VOCAL_AUDIO_FILE, _VOCAL_AUDIO_FILE, format="mp3")
 
@@ -125,24 +128,29 @@ def transcribe():
     segments = split_audio(vocal_audio)
 
     runtime = load_key("whisper.runtime")
-    if runtime != "stable":
-        raise ValueError(f"Unsupported ASR runtime: {runtime}. Only 'stable' is supported.")
+    if runtime == "stable":
+        from core.asr_backend.stable_ts import release_model, transcribe_audio_stable as transcribe_segment
+
+        rprint("[cyan]Transcribing audio with stable-ts...[/cyan]")
+    elif runtime == "faster":
+        from core.asr_backend.whisper_fasterwhisper import release_model, transcribe_audio_faster as transcribe_segment
 
-    from core.asr_backend.stable_ts import align_words_with_stable, release_model, transcribe_audio_stable
+        rprint("[cyan]Transcribing audio with faster-whisper...[/cyan]")
+    else:
+        raise ValueError(f"Unsupported ASR runtime: {runtime}. Use 'stable' or 'faster'.")
 
-    rprint("[cyan]Transcribing audio with stable-ts...[/cyan]")
     mode_selector, alignment_mode = _resolve_alignment_mode()
     rprint(f"[cyan][Experimental] Alignment mode:[/cyan] {mode_selector} ({alignment_mode})")
     whisper_language = str(load_key("whisper.language") or "").strip().lower()
 
-    # 4) Reuse loaded stable-ts model across all segments, then release once
+    # 4) Reuse loaded ASR model across all segments, then release once
     all_results = []
     combined_result = {"segments": []}
     locked_language = ""
     try:
         for idx, (start, end) in enumerate(segments):
             forced_language = locked_language or None
-            result = transcribe_audio_stable(vocal_audio, start, end, forced_language=forced_language)
+            result = transcribe_segment(vocal_audio, start, end, forced_language=forced_language)
             all_results.append(result)
 
             # If whisper.language=auto, detect once on the first usable segment and lock it for all following segments.
@@ -172,7 +180,17 @@ def transcribe():
         # 6) Alignment stage (pre-MFA)
         if alignment_mode in {"stable", "stable_mfa"}:
             rprint("[cyan][Experimental] Running stable-ts align_words...[/cyan]")
-            combined_result = align_words_with_stable(vocal_audio, combined_result)
+            from core.asr_backend.stable_ts import align_words_with_stable, release_model as release_stable_model
+
+            if runtime == "stable":
+                combined_result = align_words_with_stable(vocal_audio, combined_result)
+            else:
+                # Free the ASR model before stable-ts loads its own copy for alignment
+                release_model()
+                try:
+                    combined_result = align_words_with_stable(vocal_audio, combined_result)
+                finally:
+                    release_stable_model()
         elif alignment_mode == "raw":
             rprint("[yellow][Experimental] raw mode: skip all alignment.[/yellow]")
         elif alignment_mode == "mfa":
@@ -51,6 +51,12 @@ def translate_chunk(chunk, chunks, theme_prompt, i):
 def similar(a, b):
     return SequenceMatcher(None, a, b).ratio()
 
+def _load_translate_batch_key(key, default):
+    try:
+        return max(1, int(load_key(key)))
+    except Exception:
+        return default
+
 def _load_single_pass_full_polish_api_settings():
     defaults = {
         "key": "",
@@ -125,7 +131,8 @@ def polish_single_pass_full_text(src_lines, draft_lines, summary_prompt=None):
 @check_file_exists(_4_2_TRANSLATION)
 def translate_all():
     console.print("[bold green]Start Translating All...[/bold green]")
-    chunks = split_chunks_by_chars(chunk_size=600, max_i=10)
+    chunks = split_chunks_by_chars(chunk_size=_load_translate_batch_key("translate_chunk_size", 600),
+                                   max_i=_load_translate_batch_key("translate_max_lines", 10))
     with open(_4_1_TERMINOLOGY, 'r', encoding='utf-8') as file:
         theme_prompt = json.load(file).get('theme')
 
@@ -1,5 +1,8 @@
+import copy
 import os
 import json
+import random
+import threading
 import time
 from threading import Lock
 
@@ -17,6 +20,31 @@ from core.utils.config_utils import load_key
 LOCK = Lock()
 GPT_LOG_FOLDER = "output/gpt_log"
 
+# Reuse connections across requests (and across concurrent workers) instead of a TLS handshake per call
+_OPENAI_CLIENTS = {}
+_OPENAI_CLIENTS_LOCK = Lock()
+_HTTP_LOCAL = threading.local()
+
+
+def _get_openai_client(api_key, base_url):
+    # OpenAI clients are thread-safe and pool connections internally; one per endpoint/key
+    key = (api_key, base_url)
+    with _OPENAI_CLIENTS_LOCK:
+        client = _OPENAI_CLIENTS.get(key)
+        if client is None:
+            client = OpenAI(api_key=api_key, base_url=base_url)
+            _OPENAI_CLIENTS[key] = client
+    return client
+
+
+def _get_http_session():
+    # requests.Session is not documented as thread-safe, so keep one keep-alive session per worker thread
+    session = getattr(_HTTP_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        _HTTP_LOCAL.session = session
+    return session
+
 
 def _load_key_or_default(key, default):
     try:
@@ -63,38 +91,65 @@ def _pick_setting(override: dict, key: str, default=None):
     return default
 
 
+# {file: (stat signature, logs, {(prompt, resp_type): [items]})}; avoids re-parsing the whole log on every lookup
+_LOG_CACHE = {}
+
+
+def _stat_signature(file):
+    try:
+        st = os.stat(file)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _load_logs(file):
+    """Parsed log list plus a prompt index, re-read only when the file changed on disk (caller holds LOCK)."""
+    signature = _stat_signature(file)
+    cached = _LOG_CACHE.get(file)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    logs = []
+    if signature is not None:
+        with open(file, "r", encoding="utf-8") as f:
+            logs = json.load(f)
+    index = {}
+    for item in logs:
+        index.setdefault((item["prompt"], item["resp_type"]), []).append(item)
+    _LOG_CACHE[file] = (signature, logs, index)
+    return logs, index
+
+
 def _save_cache(model, prompt, resp_content, resp_type, resp, message=None, log_title="default"):
     with LOCK:
-        logs = []
         file = os.path.join(GPT_LOG_FOLDER, f"{log_title}.json")
         os.makedirs(os.path.dirname(file), exist_ok=True)
-        if os.path.exists(file):
-            with open(file, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        logs.append(
-            {
-                "model": model,
-                "prompt": prompt,
-                "resp_content": resp_content,
-                "resp_type": resp_type,
-                "resp": resp,
-                "message": message,
-            }
-        )
+        logs, index = _load_logs(file)
+        item = {
+            "model": model,
+            "prompt": prompt,
+            "resp_content": resp_content,
+            "resp_type": resp_type,
+            # Copy so later mutation by the caller can't leak into the log on the next rewrite
+            "resp": copy.deepcopy(resp),
+            "message": message,
+        }
+        logs.append(item)
+        index.setdefault((prompt, resp_type), []).append(item)
         with open(file, "w", encoding="utf-8") as f:
             json.dump(logs, f, ensure_ascii=False, indent=4)
+        _LOG_CACHE[file] = (_stat_signature(file), logs, index)
 
 
 def _load_cache(prompt, resp_type, log_title, model=None):
     with LOCK:
         file = os.path.join(GPT_LOG_FOLDER, f"{log_title}.json")
-        if os.path.exists(file):
-            with open(file, "r", encoding="utf-8") as f:
-                for item in json.load(f):
-                    if item["prompt"] == prompt and item["resp_type"] == resp_type:
-                        if model is not None and item.get("model") != model:
-                            continue
-                        return item["resp"]
+        _, index = _load_logs(file)
+        for item in index.get((prompt, resp_type), ()):
+            if model is not None and item.get("model") != model:
+                continue
+            return copy.deepcopy(item["resp"])
         return False
 
 
@@ -128,7 +183,7 @@ def _safe_json(obj):
 
 def _ask_gpt_chat(prompt, resp_type, model, base_url, api_key, llm_support_json, timeout):
     base_url = _normalize_openai_base_url(base_url)
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    client = _get_openai_client(api_key, base_url)
     response_format = {"type": "json_object"} if resp_type == "json" and llm_support_json else None
 
     params = dict(
@@ -169,7 +224,7 @@ def _ask_claude_messages(prompt, resp_type, model, base_url, api_key, llm_suppor
         ]
         payload["tool_choice"] = {"type": "tool", "name": "output_json"}
 
-    resp_raw = requests.post(url, headers=headers, json=payload, timeout=timeout)
+    resp_raw = _get_http_session().post(url, headers=headers, json=payload, timeout=timeout)
     resp_raw.raise_for_status()
     data = resp_raw.json()
     blocks = data.get("content", []) if isinstance(data, dict) else []
@@ -305,8 +360,10 @@ def ask_gpt(prompt, resp_type=None, valid_def=None, log_title="default", api_set
                 f"log={log_title} attempt={attempt}/{total_attempts} error={e}"
             )
             if attempt < total_attempts and retry_delay > 0:
-                rprint(f"[yellow]Retrying in {retry_delay}s...[/yellow]")
-                time.sleep(retry_delay)
+                # Up to 50% jitter so concurrent workers that failed together don't retry in lockstep
+                delay = round(retry_delay * (1 + random.random() * 0.5), 2)
+                rprint(f"[yellow]Retrying in {delay}s...[/yellow]")
+                time.sleep(delay)
 
     if last_exception:
         raise last_exception
@@ -1,4 +1,6 @@
 from ruamel.yaml import YAML
+import copy
+import os
 import threading
 
 CONFIG_PATH = 'config.yaml'
@@ -11,21 +13,40 @@ yaml.preserve_quotes = True
 # load & update config
 # -----------------------
 
+# Parsed config, reused until config.yaml changes on disk: (stat signature, data)
+_config_cache = None
+
+def _stat_signature():
+    st = os.stat(CONFIG_PATH)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _load_config():
+    """Return the parsed config, re-parsing only when the file's stat signature changes (caller holds lock)."""
+    global _config_cache
+    signature = _stat_signature()
+    if _config_cache is None or _config_cache[0] != signature:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as file:
+            _config_cache = (signature, yaml.load(file))
+    return _config_cache[1]
+
 def load_key(key):
     with lock:
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as file:
-            data = yaml.load(file)
+        data = _load_config()
 
-    keys = key.split('.')
-    value = data
-    for k in keys:
-        if isinstance(value, dict) and k in value:
-            value = value[k]
-        else:
-            raise KeyError(f"Key '{k}' not found in configuration")
+        keys = key.split('.')
+        value = data
+        for k in keys:
+            if isinstance(value, dict) and k in value:
+                value = value[k]
+            else:
+                raise KeyError(f"Key '{k}' not found in configuration")
+        # Callers get their own copy of containers so the cached tree stays intact
+        if isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
     return value
 
 def update_key(key, new_value):
+    global _config_cache
     with lock:
         with open(CONFIG_PATH, 'r', encoding='utf-8') as file:
             data = yaml.load(file)
@@ -42,6 +63,7 @@ def update_key(key, new_value):
             current[keys[-1]] = new_value
             with open(CONFIG_PATH, 'w', encoding='utf-8') as file:
                 yaml.dump(data, file)
+            _config_cache = (_stat_signature(), data)
             return True
         else:
             raise KeyError(f"Key '{keys[-1]}' not found in configuration")
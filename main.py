@@ -2,6 +2,7 @@ import asyncio
 import os
 import shutil
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -53,6 +54,31 @@ def _is_task_running() -> bool:
     return state.status not in {TaskStatus.IDLE, TaskStatus.COMPLETED, TaskStatus.ERROR}
 
 
+def _warm_up_asr_model():
+    """Preload the stable-ts model in the background when whisper.preload_on_startup is enabled."""
+    from core.utils import load_key
+
+    try:
+        enabled = bool(load_key("whisper.preload_on_startup"))
+    except KeyError:
+        enabled = False
+    if not enabled or load_key("whisper.runtime") != "stable":
+        return
+
+    try:
+        from core.asr_backend.stable_ts import warm_up_model
+
+        warm_up_model()
+    except Exception as e:
+        print(f"ASR warm-up failed: {e}")
+
+
+@app.on_event("startup")
+async def warm_up_on_startup():
+    # Runs off the event loop so the WebUI is reachable while the model loads
+    threading.Thread(target=_warm_up_asr_model, daemon=True).start()
+
+
 def _load_allowed_formats():
     from core.utils import load_key
 
@@ -125,7 +151,8 @@ async def start_task(req: StartRequest):
 
 @app.post("/api/stop")
 async def stop_task():
-    task_manager.stop_workflow()
+    # Stopping waits up to 5s for yt-dlp to exit; keep that off the event loop
+    await asyncio.to_thread(task_manager.stop_workflow)
     return {"message": "Stop signal sent"}
 
 
@@ -353,34 +380,33 @@ async def download_file(filename: str):
 async def websocket_logs(websocket: WebSocket):
     await websocket.accept()
 
-    history = list(state.logs)
-    if history:
-        await websocket.send_text("\n".join(history))
+    loop = asyncio.get_running_loop()
+    new_logs_event = asyncio.Event()
 
-    last_count = state.log_count
+    def _on_new_logs(_count):
+        loop.call_soon_threadsafe(new_logs_event.set)
 
-    try:
-        while True:
-            await asyncio.sleep(0.1)
+    state.subscribe_logs(_on_new_logs)
 
-            current_count = state.log_count
-            if current_count > last_count:
-                diff = current_count - last_count
-                logs_snapshot = list(state.logs)
-                if diff > len(logs_snapshot):
-                    new_logs = logs_snapshot
-                else:
-                    new_logs = logs_snapshot[-diff:]
+    try:
+        history, last_count = state.get_logs_since(0)
+        if history:
+            await websocket.send_text("\n".join(history))
 
-                if new_logs:
-                    await websocket.send_text("\n".join(new_logs))
+        while True:
+            await new_logs_event.wait()
+            new_logs_event.clear()
 
-                last_count = current_count
+            new_logs, last_count = state.get_logs_since(last_count)
+            if new_logs:
+                await websocket.send_text("\n".join(new_logs))
 
     except WebSocketDisconnect:
         pass
     except Exception as e:
         print(f"WS Error: {e}")
+    finally:
+        state.unsubscribe_logs(_on_new_logs)
 
 
 app.mount("/", StaticFiles(directory="static", html=True), name="static")